@@ -1,10 +1,17 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
 import os
+import importlib
+import hashlib
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-import uuid
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Set
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -12,17 +19,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 try:
-    from ..models.ats_models import AnalysisResult, APIResponse, ResumeAnalysisRequest, AnalysisStatus
-    from ..services.ai_service import AIAnalysisService, AnalysisCache
-    from ..utils.document_parser import DocumentParser
+    from ..models.ats_models import AnalysisResult, APIResponse, ResumeAnalysisRequest, BatchAnalysisRequest, AnalysisStatus, new_analysis_id
+    from ..services.result_store import create_result_store
 except ImportError:
     # For running standalone or tests
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from models.ats_models import AnalysisResult, APIResponse, ResumeAnalysisRequest, AnalysisStatus
-    from services.ai_service import AIAnalysisService, AnalysisCache
-    from utils.document_parser import DocumentParser
+    from models.ats_models import AnalysisResult, APIResponse, ResumeAnalysisRequest, BatchAnalysisRequest, AnalysisStatus, new_analysis_id
+    from services.result_store import create_result_store
+
+if TYPE_CHECKING:
+    from ..services.ai_service import AIAnalysisService, AnalysisCache
+    from ..utils.document_parser import DocumentParser, ParseCache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -34,9 +43,44 @@ app = FastAPI(
     description="Professional ATS (Application Tracking System) API for resume analysis",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Upload limits (documented by /api/supported-formats)
+ALLOWED_EXTENSIONS = ('.pdf', '.docx')
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_UPLOAD_BODY_SIZE = MAX_FILE_SIZE + 1024 * 1024  # Room for the job description and multipart framing
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_STATUS_IDS = 100
+MAX_BATCH_RESUMES = 20  # Resumes per /api/analyze-text-batch request
+
+# APIResponse envelope for stored results, serialized once
+RESULT_RESPONSE_PREFIX = b'{"success":true,"message":"Analysis result retrieved","data":'
+
+class UploadSizeLimitMiddleware:
+    """Reject uploads whose declared Content-Length is over the limit before the body is read"""
+    
+    def __init__(self, app, path: str, max_body_size: int):
+        self.app = app
+        self.path = path
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            content_length = Headers(scope=scope).get("content-length", "")
+            if content_length.isdigit() and int(content_length) > self.max_body_size:
+                response = ORJSONResponse(
+                    status_code=413,
+                    content={"detail": "File too large. Maximum size is 10MB."}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+# Added before CORS so the 413 still carries CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, path="/api/analyze-resume", max_body_size=MAX_UPLOAD_BODY_SIZE)
+
 # CORS middleware for frontend communication
 # Configure for production deployment
 allowed_origins = [
@@ -48,46 +92,139 @@ allowed_origins = [
 if os.getenv("VERCEL_FRONTEND_URL"):
     allowed_origins.append(os.getenv("VERCEL_FRONTEND_URL"))
 
-# Allow all Vercel domains in production
+# Allow all Vercel domains (including preview deployments) in production.
+# allow_origins only does exact matches, so wildcards need a regex.
+allowed_origin_regex = None
 if os.getenv("RAILWAY_ENVIRONMENT") == "production":
-    allowed_origins.extend([
-        "https://*.vercel.app",    # Vercel deployment
-        "https://smart-ats-frontend.vercel.app",  # Default frontend URL
-    ])
+    allowed_origin_regex = r"https://([a-z0-9-]+\.)*vercel\.app"
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=allowed_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
-# Initialize services (delayed initialization)
+# Compress larger JSON payloads (analysis results); small ones like /api/health stay uncompressed.
+# Disable with ATS_GZIP=0 when a proxy in front already compresses responses.
+if os.getenv("ATS_GZIP", "1") == "1":
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# Initialize services (delayed initialization, at most once per process)
 ai_service = None
 analysis_cache = None
 document_parser = None
+parse_cache = None
+_services_lock = threading.Lock()
 
-def get_ai_service():
+def import_backend_module(name: str):
+    """Import a backend module on first use, so cold starts and light routes
+    like /api/health don't pay for the Gemini SDK and document libraries"""
+    try:
+        return importlib.import_module(f"..{name}", __package__)
+    except (ImportError, TypeError):
+        # Running standalone (backend/ on sys.path)
+        return importlib.import_module(name)
+
+def get_ai_service() -> "AIAnalysisService":
     global ai_service
     if ai_service is None:
-        ai_service = AIAnalysisService()
+        with _services_lock:
+            if ai_service is None:
+                ai_service = import_backend_module("services.ai_service").AIAnalysisService()
     return ai_service
 
-def get_analysis_cache():
+def get_analysis_cache() -> "AnalysisCache":
     global analysis_cache
     if analysis_cache is None:
-        analysis_cache = AnalysisCache()
+        with _services_lock:
+            if analysis_cache is None:
+                analysis_cache = import_backend_module("services.ai_service").AnalysisCache()
     return analysis_cache
 
-def get_document_parser():
+def get_document_parser() -> "DocumentParser":
     global document_parser
     if document_parser is None:
-        document_parser = DocumentParser()
+        with _services_lock:
+            if document_parser is None:
+                document_parser = import_backend_module("utils.document_parser").DocumentParser()
     return document_parser
 
-# In-memory storage for analysis results (in production, use a database)
-analysis_results: Dict[str, AnalysisResult] = {}
+def get_parse_cache() -> "ParseCache":
+    global parse_cache
+    if parse_cache is None:
+        with _services_lock:
+            if parse_cache is None:
+                parse_cache = import_backend_module("utils.document_parser").ParseCache()
+    return parse_cache
+
+# Process pool for the CPU-bound text analyses so the event loop keeps serving requests.
+# Every uvicorn worker has its own pool, so the cores are split between them.
+WORKERS = int(os.getenv("ATS_WORKERS", max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", 1)))))
+executor: Optional[ProcessPoolExecutor] = None
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+    if executor is None:
+        with _services_lock:
+            if executor is None:
+                # Spawn rather than fork: by now this process runs threads (to_thread, service setup)
+                executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return executor
+
+# Bound submissions to the pool so excess analyses wait here rather than in its unbounded queue
+executor_slots = asyncio.Semaphore(WORKERS)
+
+async def run_in_executor(func, *args):
+    """Run a blocking function on the process pool once a worker is free"""
+    async with executor_slots:
+        return await asyncio.get_running_loop().run_in_executor(get_executor(), func, *args)
+
+# Analyses running on this process's event loop, referenced until they finish
+pending_tasks: Set[asyncio.Task] = set()
+
+def schedule_analysis(analysis_id: str, cache_key: str) -> None:
+    """Run perform_analysis independently of the request that started it"""
+    task = asyncio.create_task(perform_analysis(analysis_id, cache_key))
+    pending_tasks.add(task)
+    task.add_done_callback(pending_tasks.discard)
+
+def init_services() -> None:
+    """Create all services now rather than on the first request that needs them"""
+    get_document_parser()
+    get_parse_cache()
+    get_analysis_cache()
+    get_ai_service()
+
+@app.on_event("startup")
+async def warm_services():
+    # Pay SDK import and client setup at boot, not on the first analysis (ATS_EAGER_INIT=0 keeps it lazy)
+    if os.getenv("ATS_EAGER_INIT", "1") != "1":
+        return
+    try:
+        await asyncio.to_thread(init_services)
+    except Exception as e:
+        # e.g. GOOGLE_API_KEY missing: keep serving, the getters retry on demand
+        logger.warning("Service initialization deferred to first request: %s", e)
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    # Let in-flight analyses finish and store their results before stopping the pool
+    await asyncio.gather(*pending_tasks, return_exceptions=True)
+    if executor is not None:
+        executor.shutdown(wait=False)
+    await result_store.close()
+
+# Analysis results are shared across workers through Redis (in-memory fallback for local development)
+result_store = create_result_store()
+
+# Run analyses on Celery workers instead of in-process background tasks (requires REDIS_URL)
+USE_CELERY = os.getenv("ATS_TASK_BACKEND", "background") == "celery"
+if USE_CELERY and not os.getenv("REDIS_URL"):
+    raise RuntimeError("ATS_TASK_BACKEND=celery requires REDIS_URL for the broker and shared result store")
 
 @app.get("/")
 async def root():
@@ -99,9 +236,8 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
-@app.post("/api/analyze-resume", response_model=APIResponse)
+@app.post("/api/analyze-resume", response_model=APIResponse, response_model_exclude_none=True)
 async def analyze_resume(
-    background_tasks: BackgroundTasks,
     resume_file: UploadFile = File(...),
     job_description: str = Form(...)
 ):
@@ -114,18 +250,37 @@ async def analyze_resume(
         if not resume_file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
-        file_extension = resume_file.filename.split('.')[-1].lower()
-        if file_extension not in ['pdf', 'docx']:
+        filename = resume_file.filename.lower()
+        if not filename.endswith(ALLOWED_EXTENSIONS):
             raise HTTPException(
                 status_code=400, 
                 detail="Unsupported file format. Please upload PDF or DOCX files only."
             )
         
-        # Read file content
-        file_content = await resume_file.read()
-        
-        # Extract text from document
-        resume_text = get_document_parser().parse_document(file_content, file_extension)
+        file_extension = filename.rpartition('.')[2]
+        
+        # Hash the upload in chunks, rejecting oversized files before parsing.
+        # The multipart parser has already spooled the body to a temporary file,
+        # so the document is never copied into memory here.
+        hasher = get_parse_cache().content_hasher()
+        total_size = 0
+        while chunk := await resume_file.read(UPLOAD_CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
+            hasher.update(chunk)
+        await resume_file.seek(0)
+        
+        # Extract text from document, reusing earlier extractions of the same file
+        parse_key = get_parse_cache().generate_cache_key(hasher.hexdigest(), file_extension)
+        resume_text = get_parse_cache().get(parse_key)
+        if resume_text is None:
+            # Parse on a thread: the spooled upload can't be sent to a worker process
+            resume_text = await asyncio.to_thread(
+                get_document_parser().parse_document, resume_file.file, file_extension
+            )
+            if resume_text:
+                get_parse_cache().set(parse_key, resume_text)
         
         if not resume_text:
             raise HTTPException(
@@ -135,18 +290,26 @@ async def analyze_resume(
         
         # Check cache first
         cache_key = get_analysis_cache().generate_cache_key(resume_text, job_description)
-        cached_result = get_analysis_cache().get(cache_key)
+        cached_result = await get_cached_analysis(cache_key)
         
         if cached_result:
-            logger.info(f"Returning cached result for key: {cache_key[:8]}...")
+            logger.info("Returning cached result for key: %s...", cache_key[:8])
             return APIResponse(
                 success=True,
                 message="Analysis completed (cached)",
-                data=cached_result.dict()
+                data=cached_result
             )
         
         # Create analysis ID for tracking
-        analysis_id = str(uuid.uuid4())
+        analysis_id = new_analysis_id()
+        
+        # Point identical requests at the analysis that is already running
+        # (in-process only: Celery workers cannot resolve this process's futures)
+        if not USE_CELERY:
+            _, inflight_id, owner = await get_analysis_cache().join_inflight(cache_key, analysis_id)
+            if not owner:
+                logger.info("Sharing in-flight analysis %s for key: %s...", inflight_id, cache_key[:8])
+                return analysis_started(inflight_id)
         
         # Create initial pending result
         pending_result = AnalysisResult(
@@ -163,52 +326,111 @@ async def analyze_resume(
             status=AnalysisStatus.PROCESSING
         )
         
-        analysis_results[analysis_id] = pending_result
-        
-        # Start background analysis
-        background_tasks.add_task(
-            perform_analysis, 
-            analysis_id, 
-            resume_text, 
-            job_description, 
-            cache_key
-        )
-        
-        return APIResponse(
-            success=True,
-            message="Analysis started",
-            data={
-                "analysis_id": analysis_id,
-                "status": "processing",
-                "estimated_time": "30-60 seconds"
-            }
-        )
+        try:
+            await result_store.set(analysis_id, pending_result)
+            await result_store.record_started()
+            
+            # Stage the extracted text so the queued task only carries the ID
+            await result_store.set_input(analysis_id, resume_text, job_description)
+            
+            # Start background analysis
+            if USE_CELERY:
+                from .tasks import perform_analysis_task
+                perform_analysis_task.delay(analysis_id, cache_key)
+            else:
+                schedule_analysis(analysis_id, cache_key)
+        except Exception as e:
+            # Don't leave waiting requests hanging on an analysis that never started
+            await get_analysis_cache().resolve_inflight(cache_key, error=e)
+            raise
+        except asyncio.CancelledError:
+            await get_analysis_cache().resolve_inflight(cache_key, error=RuntimeError("Analysis request was cancelled"))
+            raise
+        
+        return analysis_started(analysis_id)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in analyze_resume: {str(e)}")
+        logger.error("Error in analyze_resume: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-async def perform_analysis(analysis_id: str, resume_text: str, job_description: str, cache_key: str):
+def analysis_started(analysis_id: str) -> APIResponse:
+    """Response pointing the client at a running analysis to poll"""
+    return APIResponse(
+        success=True,
+        message="Analysis started",
+        data={
+            "analysis_id": analysis_id,
+            "status": "processing",
+            "estimated_time": "30-60 seconds"
+        }
+    )
+
+async def get_cached_analysis(cache_key: str) -> Optional[AnalysisResult]:
+    """Look up an analysis in this process's LRU cache, then in the cache shared by all workers"""
+    result = get_analysis_cache().get(cache_key)
+    if result is None:
+        result = await result_store.get_cached_analysis(cache_key)
+        if result is not None:
+            get_analysis_cache().set(cache_key, result)
+    # Only completed analyses count as hits (entries cached before failures were excluded)
+    return result if result is not None and result.status == AnalysisStatus.COMPLETED else None
+
+async def cache_analysis(cache_key: str, result: AnalysisResult) -> None:
+    """Cache a completed analysis locally and for all other workers.
+    
+    Failed analyses (e.g. a transient Gemini error) are not cached, so identical requests retry.
+    """
+    if result.status != AnalysisStatus.COMPLETED:
+        return
+    get_analysis_cache().set(cache_key, result)
+    await result_store.cache_analysis(cache_key, result)
+
+def local_runner(offload: bool):
+    """Runner for the text analyses: the process pool, or the service's default thread"""
+    if not offload:
+        return None
+    # Sent to the workers by reference, so they import only the AI service module
+    run_local_analyses = import_backend_module("services.ai_service").run_local_analyses
+    return lambda text: run_in_executor(run_local_analyses, text)
+
+async def run_analysis(resume_text: str, job_description: str, offload: bool = True) -> AnalysisResult:
+    """Run comprehensive analysis, awaiting Gemini here while the text analyses run on
+    the process pool (or a thread when offload is off)"""
+    return await get_ai_service().analyze_resume_comprehensive_async(
+        resume_text, job_description, run_local=local_runner(offload)
+    )
+
+async def perform_analysis(analysis_id: str, cache_key: str, offload: bool = True):
     """Background task to perform comprehensive analysis"""
     try:
-        logger.info(f"Starting analysis for ID: {analysis_id}")
+        logger.info("Starting analysis for ID: %s", analysis_id)
+        
+        # Fetch the staged input (deleted only once a result is stored, so a task
+        # redelivered after a worker died can still read it)
+        staged_input = await result_store.get_input(analysis_id)
+        if staged_input is None:
+            raise ValueError("Analysis input expired before processing")
+        resume_text, job_description = staged_input
         
         # Perform comprehensive analysis
-        result = get_ai_service().analyze_resume_comprehensive(resume_text, job_description)
+        result = await run_analysis(resume_text, job_description, offload=offload)
         result.id = analysis_id  # Ensure correct ID
         
         # Store result
-        analysis_results[analysis_id] = result
+        await result_store.set(analysis_id, result)
+        await result_store.record_completed(result)
+        await result_store.delete_input(analysis_id)
         
         # Cache the result
-        get_analysis_cache().set(cache_key, result)
+        await cache_analysis(cache_key, result)
+        await get_analysis_cache().resolve_inflight(cache_key, result)
         
-        logger.info(f"Analysis completed for ID: {analysis_id}")
+        logger.info("Analysis completed for ID: %s", analysis_id)
         
     except Exception as e:
-        logger.error(f"Error in background analysis for ID {analysis_id}: {str(e)}")
+        logger.error("Error in background analysis for ID %s: %s", analysis_id, e)
         
         # Create error result
         error_result = AnalysisResult(
@@ -225,38 +447,92 @@ async def perform_analysis(analysis_id: str, resume_text: str, job_description:
             status=AnalysisStatus.FAILED
         )
         
-        analysis_results[analysis_id] = error_result
+        await result_store.set(analysis_id, error_result)
+        await result_store.delete_input(analysis_id)
+        await get_analysis_cache().resolve_inflight(cache_key, error=e)
+
+def result_etag(result: AnalysisResult) -> str:
+    """Weak ETag that changes whenever the stored result is replaced"""
+    version = f"{result.status.value}|{result.timestamp.isoformat()}"
+    return f'W/"{hashlib.blake2b(version.encode(), digest_size=8).hexdigest()}"'
 
-@app.get("/api/analysis/{analysis_id}", response_model=APIResponse)
-async def get_analysis_result(analysis_id: str):
+def payload_etag(payload: bytes) -> str:
+    """Weak ETag derived from a serialized result"""
+    return f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+@app.get("/api/analysis/statuses")
+async def get_analysis_statuses(ids: str):
+    """Get the status of several analyses at once (comma-separated IDs)"""
+    analysis_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(analysis_ids) > MAX_STATUS_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many analysis IDs. Maximum is {MAX_STATUS_IDS}"
+        )
+    
+    try:
+        results = await result_store.get_many(analysis_ids)
+        
+        return {
+            analysis_id: {
+                "status": result.status.value,
+                "timestamp": result.timestamp.isoformat()
+            } if result else None
+            for analysis_id, result in results.items()
+        }
+        
+    except Exception as e:
+        logger.error("Error getting analysis statuses: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to get analysis statuses")
+
+@app.get("/api/analysis/{analysis_id}", response_model=APIResponse, response_model_exclude_none=True)
+async def get_analysis_result(analysis_id: str, request: Request):
     """Get analysis result by ID"""
     try:
-        result = analysis_results.get(analysis_id)
+        payload = await result_store.get_json(analysis_id)
         
-        if not result:
+        if payload is None:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        return APIResponse(
-            success=True,
-            message="Analysis result retrieved",
-            data=result.dict()
+        # Let polling clients skip the body when nothing changed
+        etag = payload_etag(payload)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        # Wrap the stored JSON in the APIResponse envelope without decoding it
+        return Response(
+            content=RESULT_RESPONSE_PREFIX + payload + b"}",
+            media_type="application/json",
+            headers={"ETag": etag}
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving analysis {analysis_id}: {str(e)}")
+        logger.error("Error retrieving analysis %s: %s", analysis_id, e)
         raise HTTPException(status_code=500, detail="Failed to retrieve analysis result")
 
 @app.get("/api/analysis/{analysis_id}/status")
-async def get_analysis_status(analysis_id: str):
+async def get_analysis_status(analysis_id: str, request: Request, response: Response):
     """Get analysis status"""
     try:
-        result = analysis_results.get(analysis_id)
+        result = await result_store.get(analysis_id)
         
         if not result:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
+        etag = result_etag(result)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         return {
             "analysis_id": analysis_id,
             "status": result.status.value,
@@ -266,42 +542,107 @@ async def get_analysis_status(analysis_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting analysis status {analysis_id}: {str(e)}")
+        logger.error("Error getting analysis status %s: %s", analysis_id, e)
         raise HTTPException(status_code=500, detail="Failed to get analysis status")
 
-@app.post("/api/analyze-text", response_model=APIResponse)
+async def perform_text_analysis(resume_text: str, job_description: str, cache_key: str) -> None:
+    """Run a text analysis and store it, resolving the in-flight future its requests wait on"""
+    try:
+        result = await run_analysis(resume_text, job_description)
+        
+        # Cache the result
+        await cache_analysis(cache_key, result)
+        
+        # Store result
+        await result_store.set(result.id, result)
+        await result_store.record_started()
+        await result_store.record_completed(result)
+    except Exception as e:
+        # Raised to the waiting requests; nothing awaits this task itself
+        logger.error("Error in text analysis: %s", e)
+        await get_analysis_cache().resolve_inflight(cache_key, error=e)
+        return
+    except asyncio.CancelledError:
+        await get_analysis_cache().resolve_inflight(cache_key, error=RuntimeError("Analysis was cancelled"))
+        raise
+    await get_analysis_cache().resolve_inflight(cache_key, result)
+
+@app.post("/api/analyze-text", response_model=APIResponse, response_model_exclude_none=True)
 async def analyze_resume_text(request: ResumeAnalysisRequest):
     """Analyze resume from text input (for testing purposes)"""
     try:
         # Check cache first
         cache_key = get_analysis_cache().generate_cache_key(request.resume_text, request.job_description)
-        cached_result = get_analysis_cache().get(cache_key)
+        cached_result = await get_cached_analysis(cache_key)
         
         if cached_result:
             return APIResponse(
                 success=True,
                 message="Analysis completed (cached)",
-                data=cached_result.dict()
+                data=cached_result
             )
         
-        # Perform analysis
-        result = get_ai_service().analyze_resume_comprehensive(request.resume_text, request.job_description)
+        # Share the result of an identical analysis that is already running; otherwise start one
+        # as its own task, so it finishes for the other requests even if this one disconnects
+        inflight, _, owner = await get_analysis_cache().join_inflight(cache_key)
+        if owner:
+            task = asyncio.create_task(perform_text_analysis(request.resume_text, request.job_description, cache_key))
+            pending_tasks.add(task)
+            task.add_done_callback(pending_tasks.discard)
         
-        # Cache the result
-        get_analysis_cache().set(cache_key, result)
+        result = await asyncio.shield(inflight)
+        return APIResponse(
+            success=True,
+            message="Analysis completed" if owner else "Analysis completed (shared)",
+            data=result
+        )
         
-        # Store result
-        analysis_results[result.id] = result
+    except Exception as e:
+        logger.error("Error in analyze_resume_text: %s", e)
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@app.post("/api/analyze-text-batch", response_model=APIResponse, response_model_exclude_none=True)
+async def analyze_resume_texts_batch(request: BatchAnalysisRequest):
+    """Analyze several resume texts against one job description"""
+    if not request.resume_texts:
+        raise HTTPException(status_code=400, detail="At least one resume text is required")
+    if len(request.resume_texts) > MAX_BATCH_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_RESUMES} resumes can be analyzed per request"
+        )
+    
+    try:
+        # Serve cached analyses, then run the rest together
+        cache_keys = [
+            get_analysis_cache().generate_cache_key(resume_text, request.job_description)
+            for resume_text in request.resume_texts
+        ]
+        results = [await get_cached_analysis(cache_key) for cache_key in cache_keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            analyzed = await get_ai_service().analyze_resumes_batch_async(
+                [request.resume_texts[i] for i in missing],
+                request.job_description,
+                run_local=local_runner(True)
+            )
+            for i, result in zip(missing, analyzed):
+                results[i] = result
+                await cache_analysis(cache_keys[i], result)
+                await result_store.set(result.id, result)
+                await result_store.record_started()
+                await result_store.record_completed(result)
         
         return APIResponse(
             success=True,
-            message="Analysis completed",
-            data=result.dict()
+            message=f"Analyzed {len(results)} resumes ({len(results) - len(missing)} cached)",
+            data={"results": results}
         )
         
     except Exception as e:
-        logger.error(f"Error in analyze_resume_text: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        logger.error("Error in analyze_resume_texts_batch: %s", e)
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
 @app.get("/api/supported-formats")
 async def get_supported_formats():
@@ -320,24 +661,28 @@ async def get_supported_formats():
 async def delete_analysis(analysis_id: str):
     """Delete analysis result"""
     try:
-        if analysis_id not in analysis_results:
+        if not await result_store.delete(analysis_id):
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        del analysis_results[analysis_id]
-        
         return {"message": "Analysis deleted successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting analysis {analysis_id}: {str(e)}")
+        logger.error("Error deleting analysis %s: %s", analysis_id, e)
         raise HTTPException(status_code=500, detail="Failed to delete analysis")
 
 @app.get("/api/analytics/summary")
 async def get_analytics_summary():
-    """Get analytics summary of all analyses"""
+    """Get all-time analytics summary.
+    
+    total_analyses and completed_analyses count every analysis ever recorded (since
+    process start without Redis), including results that have since been deleted or expired.
+    """
     try:
-        if not analysis_results:
+        stats = await result_store.get_stats()
+        
+        if not stats.total:
             return {
                 "total_analyses": 0,
                 "average_score": 0,
@@ -345,43 +690,46 @@ async def get_analytics_summary():
                 "success_rate": 0
             }
         
-        completed_analyses = [r for r in analysis_results.values() if r.status == AnalysisStatus.COMPLETED]
-        
-        if not completed_analyses:
+        if not stats.completed:
             return {
-                "total_analyses": len(analysis_results),
+                "total_analyses": stats.total,
                 "average_score": 0,
                 "common_issues": [],
                 "success_rate": 0
             }
         
-        # Calculate statistics
-        total_score = sum(r.percentage_score for r in completed_analyses)
-        average_score = total_score / len(completed_analyses)
-        
-        # Collect common issues
-        all_grammar_issues = []
-        all_format_issues = []
-        for result in completed_analyses:
-            all_grammar_issues.extend([issue.text for issue in result.grammar_mistakes])
-            all_format_issues.extend([issue.issue_type for issue in result.format_issues])
-        
-        # Calculate success rate
-        success_rate = len(completed_analyses) / len(analysis_results) * 100
+        # Calculate statistics from running counters
+        average_score = stats.score_sum / stats.completed
+        success_rate = stats.completed / stats.total * 100
         
         return {
-            "total_analyses": len(analysis_results),
-            "completed_analyses": len(completed_analyses),
+            "total_analyses": stats.total,
+            "completed_analyses": stats.completed,
             "average_score": round(average_score, 2),
             "success_rate": round(success_rate, 2),
-            "common_grammar_issues": list(set(all_grammar_issues))[:5],
-            "common_format_issues": list(set(all_format_issues))
+            "common_grammar_issues": [text for text, _ in stats.grammar_counter.most_common(5)],
+            "common_format_issues": [issue for issue, _ in stats.format_counter.most_common()]
         }
         
     except Exception as e:
-        logger.error(f"Error getting analytics summary: {str(e)}")
+        logger.error("Error getting analytics summary: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get analytics summary")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    
+    dev_mode = bool(os.getenv("DEV"))
+    # Multiple workers only share results through Redis, so default to one without it
+    default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+    workers = 1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", default_workers))
+    # Workers size their analysis process pools from this
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "backend.app.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers,
+        loop="auto" if os.name == "nt" else "uvloop",  # uvloop is not available on Windows
+        http="httptools",
+        reload=dev_mode
+    )
\ No newline at end of file
@@ -0,0 +1,39 @@
+import os
+import asyncio
+import logging
+from celery import Celery
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Celery worker pool for resume analysis
+# Run workers with: celery -A backend.app.tasks worker --concurrency=$(nproc)
+celery_app = Celery('ats', broker=os.getenv('REDIS_URL'))
+celery_app.conf.update(
+    task_serializer='json',
+    accept_content=['json'],
+    task_acks_late=True,
+    worker_prefetch_multiplier=1
+)
+
+# One event loop per worker process so the async Redis client keeps its connections
+_loop = None
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+@celery_app.task(name='ats.perform_analysis')
+def perform_analysis_task(analysis_id: str, cache_key: str):
+    """Run comprehensive analysis on a worker and write the result to the shared store"""
+    from .main import perform_analysis
+
+    # The worker process is already dedicated to this task, so analyze inline
+    _run(perform_analysis(analysis_id, cache_key, offload=False))
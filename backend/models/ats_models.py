@@ -1,7 +1,18 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
+import os
+import time
+import uuid
+
+def new_analysis_id() -> str:
+    """Generate a time-ordered (UUIDv7) analysis ID, so IDs sort by creation time"""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 9562 variant
+    return str(uuid.UUID(int=value))
 
 class FileType(str, Enum):
     PDF = "pdf"
@@ -22,7 +33,7 @@ class GrammarIssue(BaseModel):
 class RepetitionIssue(BaseModel):
     word: str
     count: int
-    positions: List[int]
+    positions: Optional[List[int]] = None  # Word offsets in the text, omitted when not collected
 
 class FormatIssue(BaseModel):
     issue_type: str
@@ -63,8 +74,12 @@ class ResumeAnalysisRequest(BaseModel):
     resume_text: str
     file_type: FileType
 
+class BatchAnalysisRequest(BaseModel):
+    job_description: str
+    resume_texts: List[str]
+
 class APIResponse(BaseModel):
     success: bool
     message: str
-    data: Optional[Dict[str, Any]] = None
+    data: Optional[Union[AnalysisResult, Dict[str, Any]]] = None
     error: Optional[str] = None
\ No newline at end of file
@@ -1,31 +1,237 @@
 import google.generativeai as genai
 import os
+import asyncio
+import hashlib
+import itertools
 import json
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
-import uuid
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 try:
-    from ..utils.document_parser import TextAnalyzer
-    from ..models.ats_models import AnalysisResult, GrammarIssue, RepetitionIssue, FormatIssue, AnalysisStatus
+    from ..utils.document_parser import TextAnalyzer, extract_text_features, tokenize
+    from ..models.ats_models import AnalysisResult, GrammarIssue, RepetitionIssue, FormatIssue, AnalysisStatus, new_analysis_id
 except ImportError:
     # For running standalone or tests
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from utils.document_parser import TextAnalyzer
-    from models.ats_models import AnalysisResult, GrammarIssue, RepetitionIssue, FormatIssue, AnalysisStatus
+    from utils.document_parser import TextAnalyzer, extract_text_features, tokenize
+    from models.ats_models import AnalysisResult, GrammarIssue, RepetitionIssue, FormatIssue, AnalysisStatus, new_analysis_id
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = 'gemini-1.5-flash'
+# Bump when the prompt or response parsing changes so cached analyses are recomputed
+PROMPT_VERSION = 'v3'
+
+# Static parts of the analysis prompt, around the resume and job description
+PROMPT_HEADER = """Act as an expert ATS (Application Tracking System) with deep knowledge in recruitment, HR analytics, and professional resume evaluation. Analyze the provided resume against the job description with the highest accuracy and professional insight.
+
+**ANALYSIS REQUIREMENTS:**
+1. Calculate precise percentage match (0-100) based on skills, experience, and requirements alignment
+2. Focus primarily on technical skills, experience relevance, and job requirement matches
+3. Identify specific missing keywords that are critical for the role
+4. Provide constructive career-focused recommendations and avoid detailed grammar analysis
+5. Consider industry standards and current job market competitiveness
+6. Emphasize content substance, skill alignment, and career development over writing mechanics
+7. Prioritize ATS compatibility and keyword optimization over linguistic perfection
+"""
+PROMPT_FOOTER = """**REQUIRED OUTPUT FORMAT (JSON):**
+Return ONLY a valid JSON object with these exact fields:
+{
+    "jd_match": 75,
+    "missing_keywords": ["Python", "Machine Learning", "SQL"],
+    "profile_summary": "Professional analysis focusing on career alignment and skill gaps with actionable career advice",
+    "strengths": ["Strong technical background", "Relevant experience"],
+    "weaknesses": ["Missing cloud experience", "Limited leadership background"],
+    "recommendations": ["Add cloud certifications", "Highlight team collaboration"]
+}
+
+CRITICAL REQUIREMENTS:
+- jd_match must be a single number between 0-100 (not a list or string)
+- missing_keywords must be an array of strings
+- All fields are required
+- Return only the JSON object, no additional text
+
+**IMPORTANT:** Focus exclusively on career development, skill gaps, and ATS optimization.
+Do NOT analyze grammar, writing style, or linguistic elements.
+Provide actionable insights for improving job match percentage and career advancement."""
+# Longest resume and job description text sent to Gemini, after whitespace is collapsed
+MAX_PROMPT_RESUME_CHARS = 6000
+MAX_PROMPT_JD_CHARS = 4000
+
+# Gemini attempts before falling back to keyword scoring, and the base delay between them
+AI_ATTEMPTS = 2
+AI_RETRY_DELAY = 1.0
+
+class AIResponseError(Exception):
+    """Gemini replied, but not with a usable analysis"""
+
+# Ask Gemini for a bare JSON body (responses are still cleaned if parsing it fails)
+JSON_GENERATION_CONFIG = genai.GenerationConfig(response_mime_type="application/json")
+
+# Markdown code fences around JSON in Gemini responses
+JSON_FENCE_OPEN_PATTERN = re.compile(r'```json\s*')
+JSON_FENCE_CLOSE_PATTERN = re.compile(r'```\s*$')
+
+# Overall score weight distribution - heavily emphasizing content relevance over language mechanics
+SCORE_WEIGHTS = {
+    'jd_match': 0.70,     # 70% - Primary focus on job alignment
+    'grammar': 0.05,      # 5% - Minimal emphasis on grammar
+    'repetition': 0.05,   # 5% - Minimal emphasis on repetition
+    'format': 0.15,       # 15% - Structure remains important for ATS
+    'readability': 0.05   # 5% - Basic readability only
+}
+
+# Words ignored when matching job description keywords
+COMMON_WORDS = frozenset({'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'})
+
+@lru_cache(maxsize=64)
+def job_keywords(job_description: str) -> FrozenSet[str]:
+    """Job description keywords without common words, built once per job description in a batch"""
+    return frozenset(tokenize(job_description)).difference(COMMON_WORDS)
+
+@lru_cache(maxsize=64)
+def long_job_keywords(job_description: str) -> FrozenSet[str]:
+    """Job description words over 5 letters, the candidates for missing keywords"""
+    return frozenset(word for word in tokenize(job_description) if len(word) > 5)
+
+def extract_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} span in text, ignoring braces inside JSON strings.
+    
+    Anything around the object (prose, markdown fences) is skipped in the same pass.
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def analysis_key(resume_text: str, job_description: str) -> str:
+    """Hash a resume/JD pair with the model and prompt version.
+
+    Each text is length-prefixed, so different splits of the same characters can't collide.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (resume_text, job_description):
+        data = part.encode()
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    h.update(f"{GEMINI_MODEL}|{PROMPT_VERSION}".encode())
+    return h.hexdigest()
+
+# Expired disk cache entries that are never read again are removed by a sweep every this many writes
+DISK_CACHE_SWEEP_INTERVAL = 256
+
+class DiskCache:
+    """JSON-file cache of AI responses that survives restarts and is shared by worker processes"""
+    
+    def __init__(self, directory: str, ttl: int = 86400):
+        self._directory = directory
+        self._ttl = ttl
+        self._writes = itertools.count(1)
+        os.makedirs(directory, exist_ok=True)
+        self.sweep()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.json")
+    
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a cached entry, deleting it once older than the TTL"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self._ttl:
+                self._remove(path)
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def sweep(self) -> None:
+        """Delete expired entries, and temporary files left behind by interrupted writers"""
+        cutoff = time.time() - self._ttl
+        try:
+            with os.scandir(self._directory) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.json', '.tmp')):
+                        continue
+                    try:
+                        expired = entry.stat().st_mtime < cutoff
+                    except OSError:
+                        continue
+                    if expired:
+                        self._remove(entry.path)
+        except OSError as e:
+            logger.warning("Failed to sweep AI response cache: %s", e)
+    
+    def set(self, key: str, value: Dict) -> None:
+        """Cache an entry, writing to a temporary file first so readers never see partial JSON"""
+        temp_path = None
+        try:
+            # Unique per writer, so threads and processes writing the same key never share one
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self._directory, prefix=f"{key}.",
+                                             suffix='.tmp', delete=False) as f:
+                temp_path = f.name
+                json.dump(value, f)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning("Failed to write AI response cache entry: %s", e)
+            if temp_path is not None:
+                self._remove(temp_path)
+        
+        if next(self._writes) % DISK_CACHE_SWEEP_INTERVAL == 0:
+            self.sweep()
+
+@dataclass
+class LocalAnalysis:
+    """Results of the analyses that run without the AI model"""
+    grammar_issues: List[GrammarIssue]
+    repetition_issues: List[RepetitionIssue]
+    format_issues: List[FormatIssue]
+    readability_score: float
+
 class AIAnalysisService:
     """Enhanced AI service for comprehensive ATS analysis"""
     
@@ -36,190 +242,270 @@ class AIAnalysisService:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
         
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model = genai.GenerativeModel(GEMINI_MODEL)
         self.text_analyzer = TextAnalyzer()
+        # Runs Gemini calls for the synchronous analysis path
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini")
+        
+        # Optional persistent cache of Gemini responses (e.g. for local runs without Redis)
+        cache_dir = os.getenv("ATS_CACHE_DIR")
+        self.response_cache = DiskCache(cache_dir, int(os.getenv("ATS_RESULT_TTL", 86400))) if cache_dir else None
     
     def analyze_resume_comprehensive(self, resume_text: str, job_description: str) -> AnalysisResult:
         """Perform comprehensive ATS analysis including AI evaluation and text analysis"""
-        analysis_id = str(uuid.uuid4())
+        analysis_id = new_analysis_id()
         
         try:
-            # 1. AI-based analysis
-            ai_result = self._get_ai_analysis(resume_text, job_description)
-            
-            # 2. Grammar analysis
-            grammar_issues = self._analyze_grammar_enhanced(resume_text)
+            # 1. AI-based analysis, in flight while the local analyses run on this thread
+            ai_future = self._executor.submit(self._get_ai_analysis, resume_text, job_description)
             
-            # 3. Word repetition analysis
-            repetition_issues = self._analyze_repetitions(resume_text)
+            # 2-4. Grammar, repetition, format and readability analysis
+            local_analysis = self.run_local_analyses(resume_text)
+            ai_result = ai_future.result()
             
-            # 4. Format and readability analysis
-            format_issues = self._analyze_format(resume_text)
-            readability_score = self.text_analyzer.calculate_readability_score(resume_text)
+            return self._build_result(analysis_id, ai_result, local_analysis)
             
-            # 5. Calculate overall percentage score
-            overall_score = self._calculate_overall_score(
-                ai_result.get('jd_match', 0),
-                grammar_issues,
-                repetition_issues,
-                format_issues,
-                readability_score
-            )
-            
-            # Create comprehensive result
-            result = AnalysisResult(
-                id=analysis_id,
-                percentage_score=overall_score,
-                jd_match=ai_result.get('jd_match', 0),
-                missing_keywords=ai_result.get('missing_keywords', []),
-                profile_summary=ai_result.get('profile_summary', ''),
-                grammar_mistakes=grammar_issues,
-                word_repetitions=repetition_issues,
-                format_issues=format_issues,
-                readability_score=readability_score,
-                timestamp=datetime.now(),
-                status=AnalysisStatus.COMPLETED
+        except Exception as e:
+            logger.error("Error in comprehensive analysis: %s", e)
+            return self._failed_result(analysis_id)
+    
+    async def analyze_resume_comprehensive_async(
+        self,
+        resume_text: str,
+        job_description: str,
+        run_local: Optional[Callable[[str], Awaitable[LocalAnalysis]]] = None
+    ) -> AnalysisResult:
+        """Perform comprehensive ATS analysis with the Gemini call overlapping the local analyses.
+        
+        run_local runs the CPU-bound local analyses; by default they go to a thread.
+        """
+        analysis_id = new_analysis_id()
+        if run_local is None:
+            run_local = lambda text: asyncio.to_thread(self.run_local_analyses, text)
+        
+        try:
+            ai_result, local_analysis = await asyncio.gather(
+                self._get_ai_analysis_async(resume_text, job_description),
+                run_local(resume_text)
             )
-            
-            logger.info(f"Analysis completed for ID: {analysis_id}")
-            return result
+            return self._build_result(analysis_id, ai_result, local_analysis)
             
         except Exception as e:
-            logger.error(f"Error in comprehensive analysis: {str(e)}")
-            return AnalysisResult(
-                id=analysis_id,
-                percentage_score=0,
-                jd_match=0,
-                missing_keywords=[],
-                profile_summary="Analysis failed due to an error",
-                grammar_mistakes=[],
-                word_repetitions=[],
-                format_issues=[],
-                readability_score=0,
-                timestamp=datetime.now(),
-                status=AnalysisStatus.FAILED
-            )
+            logger.error("Error in comprehensive analysis: %s", e)
+            return self._failed_result(analysis_id)
+    
+    async def analyze_resumes_batch_async(
+        self,
+        resume_texts: List[str],
+        job_description: str,
+        run_local: Optional[Callable[[str], Awaitable[LocalAnalysis]]] = None,
+        concurrency: int = 8
+    ) -> List[AnalysisResult]:
+        """Analyze several resumes against one job description, at most `concurrency` at a time.
+        
+        Results keep the order of resume_texts. JD tokens are cached, so the JD is only scanned once.
+        """
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def analyze(resume_text: str) -> AnalysisResult:
+            async with slots:
+                return await self.analyze_resume_comprehensive_async(resume_text, job_description, run_local)
+        
+        return list(await asyncio.gather(*(analyze(resume_text) for resume_text in resume_texts)))
+    
+    def run_local_analyses(self, resume_text: str) -> LocalAnalysis:
+        """Run the analyses that don't need the AI model"""
+        return run_local_analyses(resume_text)
+    
+    def _build_result(self, analysis_id: str, ai_result: Dict, local_analysis: LocalAnalysis) -> AnalysisResult:
+        """Combine AI and local analyses into a scored result"""
+        # 5. Calculate overall percentage score
+        overall_score = self._calculate_overall_score(
+            ai_result.get('jd_match', 0),
+            local_analysis.grammar_issues,
+            local_analysis.repetition_issues,
+            local_analysis.format_issues,
+            local_analysis.readability_score
+        )
+        
+        # Create comprehensive result
+        result = AnalysisResult(
+            id=analysis_id,
+            percentage_score=overall_score,
+            jd_match=ai_result.get('jd_match', 0),
+            missing_keywords=ai_result.get('missing_keywords', []),
+            profile_summary=ai_result.get('profile_summary', ''),
+            grammar_mistakes=local_analysis.grammar_issues,
+            word_repetitions=local_analysis.repetition_issues,
+            format_issues=local_analysis.format_issues,
+            readability_score=local_analysis.readability_score,
+            timestamp=datetime.now(),
+            status=AnalysisStatus.COMPLETED
+        )
+        
+        logger.info("Analysis completed for ID: %s", analysis_id)
+        return result
+    
+    def _failed_result(self, analysis_id: str) -> AnalysisResult:
+        """Result returned when the analysis raised"""
+        return AnalysisResult(
+            id=analysis_id,
+            percentage_score=0,
+            jd_match=0,
+            missing_keywords=[],
+            profile_summary="Analysis failed due to an error",
+            grammar_mistakes=[],
+            word_repetitions=[],
+            format_issues=[],
+            readability_score=0,
+            timestamp=datetime.now(),
+            status=AnalysisStatus.FAILED
+        )
     
     def _get_ai_analysis(self, resume_text: str, job_description: str) -> Dict:
         """Get AI-based analysis from Gemini with fallback"""
+        cache_key, cached = self._get_cached_ai_analysis(resume_text, job_description)
+        if cached is not None:
+            return cached
+        
         prompt = self._create_enhanced_prompt(resume_text, job_description)
         
-        try:
-            response = self.model.generate_content(prompt)
-            if response.text:
-                result = self._parse_ai_response(response.text)
-                # If AI analysis succeeds but returns 0, provide a basic fallback score
-                if result.get('jd_match', 0) == 0:
-                    logger.warning("AI returned 0% match, applying fallback scoring")
-                    fallback_score = self._calculate_fallback_score(resume_text, job_description)
-                    result['jd_match'] = fallback_score
-                return result
-            else:
-                logger.error("AI response was empty")
-                raise Exception("Empty AI response")
-        except Exception as e:
-            logger.error(f"AI analysis error: {str(e)}")
-            # Fallback to keyword-based analysis
+        for attempt in range(1, AI_ATTEMPTS + 1):
+            try:
+                response = self.model.generate_content(prompt, generation_config=JSON_GENERATION_CONFIG)
+                return self._process_ai_response(response, resume_text, job_description, cache_key)
+            except Exception as e:
+                logger.error("AI analysis error (attempt %s of %s): %s", attempt, AI_ATTEMPTS, e)
+                if attempt < AI_ATTEMPTS:
+                    prompt = self._retry_prompt(prompt, e)
+                    time.sleep(AI_RETRY_DELAY * attempt)
+        
+        return self._fallback_ai_analysis(resume_text, job_description)
+    
+    async def _get_ai_analysis_async(self, resume_text: str, job_description: str) -> Dict:
+        """Get AI-based analysis from Gemini with fallback, without blocking the event loop"""
+        cache_key, cached = await self._run_cache_io(self._get_cached_ai_analysis, resume_text, job_description)
+        if cached is not None:
+            return cached
+        
+        prompt = self._create_enhanced_prompt(resume_text, job_description)
+        
+        for attempt in range(1, AI_ATTEMPTS + 1):
+            try:
+                response = await self.model.generate_content_async(prompt, generation_config=JSON_GENERATION_CONFIG)
+                return await self._run_cache_io(
+                    self._process_ai_response, response, resume_text, job_description, cache_key
+                )
+            except Exception as e:
+                logger.error("AI analysis error (attempt %s of %s): %s", attempt, AI_ATTEMPTS, e)
+                if attempt < AI_ATTEMPTS:
+                    prompt = self._retry_prompt(prompt, e)
+                    await asyncio.sleep(AI_RETRY_DELAY * attempt)
+        
+        return self._fallback_ai_analysis(resume_text, job_description)
+    
+    async def _run_cache_io(self, func, *args):
+        """Run a step that may read or write the disk cache on a thread, keeping file I/O off the event loop"""
+        if self.response_cache is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    
+    @staticmethod
+    def _retry_prompt(prompt: str, error: Exception) -> str:
+        """Prompt for another attempt, telling Gemini what was wrong with an unusable reply"""
+        if isinstance(error, AIResponseError):
+            return f"{prompt}\n\nYour previous reply could not be used ({error}). Return only the JSON object described above."
+        return prompt
+    
+    def _get_cached_ai_analysis(self, resume_text: str, job_description: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Look up the persistent response cache, returning its key and any cached analysis.
+        
+        Whitespace is collapsed first, so re-exports of the same documents share a Gemini answer.
+        """
+        if self.response_cache is None:
+            return None, None
+        cache_key = analysis_key(' '.join(resume_text.split()), ' '.join(job_description.split()))
+        return cache_key, self.response_cache.get(cache_key)
+    
+    def _process_ai_response(self, response, resume_text: str, job_description: str,
+                             cache_key: Optional[str]) -> Dict:
+        """Parse a Gemini response, falling back to keyword scoring for a 0% match"""
+        if not response.text:
+            raise AIResponseError("Empty AI response")
+        
+        result = self._parse_ai_response(response.text)
+        # If AI analysis succeeds but returns 0, provide a basic fallback score
+        if result.get('jd_match', 0) == 0:
+            logger.warning("AI returned 0% match, applying fallback scoring")
             fallback_score = self._calculate_fallback_score(resume_text, job_description)
-            return {
-                'jd_match': fallback_score,
-                'missing_keywords': self._extract_missing_keywords(resume_text, job_description),
-                'profile_summary': 'Analysis completed with fallback method due to AI service issue'
-            }
+            result['jd_match'] = fallback_score
+        elif cache_key is not None:
+            self.response_cache.set(cache_key, result)
+        return result
+    
+    def _fallback_ai_analysis(self, resume_text: str, job_description: str) -> Dict:
+        """Keyword-based analysis used when the AI service fails"""
+        fallback_score = self._calculate_fallback_score(resume_text, job_description)
+        return {
+            'jd_match': fallback_score,
+            'missing_keywords': self._extract_missing_keywords(resume_text, job_description),
+            'profile_summary': 'Analysis completed with fallback method due to AI service issue'
+        }
     
     def _calculate_fallback_score(self, resume_text: str, job_description: str) -> float:
         """Calculate basic keyword matching score as fallback"""
         try:
-            # Extract keywords from job description
-            jd_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower()))
-            # Remove common words
-            common_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
-            jd_keywords = jd_words - common_words
+            # Keywords from job description, without common words
+            jd_keywords = job_keywords(job_description)
             
-            # Count matches in resume
-            resume_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower()))
-            matches = len(jd_keywords.intersection(resume_words))
+            # Count matches in resume (probing the small keyword set, no resume set needed)
+            matches = len(jd_keywords.intersection(tokenize(resume_text)))
             total_keywords = max(len(jd_keywords), 1)
             
             # Calculate percentage with some baseline
-            base_score = min(85, max(35, (matches / total_keywords) * 100))  # 35-85% range
+            match_percent = (matches / total_keywords) * 100
+            base_score = 35 if match_percent < 35 else 85 if match_percent > 85 else match_percent  # 35-85% range
             
-            logger.info(f"Fallback scoring: {matches}/{total_keywords} keywords matched = {base_score}%")
+            logger.debug("Fallback scoring: %s/%s keywords matched = %s%%", matches, total_keywords, base_score)
             return round(base_score, 2)
             
         except Exception as e:
-            logger.error(f"Fallback scoring error: {str(e)}")
+            logger.error("Fallback scoring error: %s", e)
             return 45.0  # Default reasonable score
     
     def _extract_missing_keywords(self, resume_text: str, job_description: str) -> List[str]:
         """Extract missing keywords for fallback analysis"""
         try:
-            jd_words = set(re.findall(r'\b[a-zA-Z]{4,}\b', job_description.lower()))
-            resume_words = set(re.findall(r'\b[a-zA-Z]{4,}\b', resume_text.lower()))
-            
             # Find important missing words (longer words are usually more important)
-            missing = [word for word in jd_words if word not in resume_words and len(word) > 5]
+            missing = long_job_keywords(job_description).difference(tokenize(resume_text))
             return sorted(missing, key=len, reverse=True)[:8]  # Return top 8 missing keywords
             
         except Exception:
             return ['skills', 'experience', 'requirements']
     
     def _create_enhanced_prompt(self, resume_text: str, job_description: str) -> str:
-        """Create enhanced prompt for comprehensive analysis"""
-        return f"""
-        Act as an expert ATS (Application Tracking System) with deep knowledge in recruitment, 
-        HR analytics, and professional resume evaluation. Analyze the provided resume against 
-        the job description with the highest accuracy and professional insight.
-
-        **ANALYSIS REQUIREMENTS:**
-        1. Calculate precise percentage match (0-100) based on skills, experience, and requirements alignment
-        2. Focus primarily on technical skills, experience relevance, and job requirement matches
-        3. Identify specific missing keywords that are critical for the role
-        4. Provide constructive career-focused recommendations and avoid detailed grammar analysis
-        5. Consider industry standards and current job market competitiveness
-        6. Emphasize content substance, skill alignment, and career development over writing mechanics
-        7. Prioritize ATS compatibility and keyword optimization over linguistic perfection
-
-        **RESUME:**
-        {resume_text}
-
-        **JOB DESCRIPTION:**
-        {job_description}
-
-        **REQUIRED OUTPUT FORMAT (JSON):**
-        Return ONLY a valid JSON object with these exact fields:
-        {{
-            "jd_match": 75,
-            "missing_keywords": ["Python", "Machine Learning", "SQL"],
-            "profile_summary": "Professional analysis focusing on career alignment and skill gaps with actionable career advice",
-            "strengths": ["Strong technical background", "Relevant experience"],
-            "weaknesses": ["Missing cloud experience", "Limited leadership background"],
-            "recommendations": ["Add cloud certifications", "Highlight team collaboration"]
-        }}
-        
-        CRITICAL REQUIREMENTS:
-        - jd_match must be a single number between 0-100 (not a list or string)
-        - missing_keywords must be an array of strings
-        - All fields are required
-        - Return only the JSON object, no additional text
-
-        **IMPORTANT:** Focus exclusively on career development, skill gaps, and ATS optimization. 
-        Do NOT analyze grammar, writing style, or linguistic elements.
-        Provide actionable insights for improving job match percentage and career advancement.
-        """
+        """Create enhanced prompt for comprehensive analysis, with whitespace collapsed and long texts capped"""
+        resume_clean = ' '.join(resume_text.split())[:MAX_PROMPT_RESUME_CHARS]
+        jd_clean = ' '.join(job_description.split())[:MAX_PROMPT_JD_CHARS]
+        return f"{PROMPT_HEADER}\n**RESUME:**\n{resume_clean}\n\n**JOB DESCRIPTION:**\n{jd_clean}\n\n{PROMPT_FOOTER}"
     
     def _parse_ai_response(self, response_text: str) -> Dict:
-        """Parse AI response with error handling"""
+        """Parse AI response, raising AIResponseError when it holds no usable JSON object"""
         try:
             # Log the raw response for debugging
-            logger.info(f"AI Raw Response: {response_text[:500]}...")  # First 500 chars
-            
-            # Clean the response to extract JSON
-            cleaned_response = self._clean_json_response(response_text)
-            logger.info(f"Cleaned JSON: {cleaned_response[:300]}...")  # First 300 chars
+            logger.debug("AI Raw Response: %s...", response_text[:500])  # First 500 chars
             
-            result = json.loads(cleaned_response)
-            logger.info(f"Parsed JSON result: {result}")
+            try:
+                # JSON mode returns the object alone
+                result = json.loads(response_text)
+            except ValueError:
+                # Clean the response to extract JSON
+                cleaned_response = self._clean_json_response(response_text)
+                logger.debug("Cleaned JSON: %s...", cleaned_response[:300])  # First 300 chars
+                result = json.loads(cleaned_response)
+            if not isinstance(result, dict):
+                raise ValueError("AI response is not a JSON object")
+            logger.debug("Parsed JSON result: %s", result)
             
             # Validate and sanitize the result
             jd_match_value = result.get('jd_match', 0)
@@ -244,28 +530,28 @@ class AIAnalysisService:
                 'recommendations': result.get('recommendations', [])[:5]
             }
             
-            logger.info(f"Final processed result: {processed_result}")
+            logger.debug("Final processed result: %s", processed_result)
             return processed_result
             
         except Exception as e:
-            logger.error(f"Error parsing AI response: {str(e)}")
-            logger.error(f"Full response text: {response_text}")
-            return {'jd_match': 0, 'missing_keywords': [], 'profile_summary': 'Failed to parse AI response'}
+            logger.error("Error parsing AI response: %s", e)
+            logger.error("Full response text: %s", response_text)
+            raise AIResponseError(f"Failed to parse AI response: {e}") from e
     
     def _clean_json_response(self, response_text: str) -> str:
         """Clean and extract JSON from AI response"""
-        # Remove markdown code blocks if present
-        response_text = re.sub(r'```json\s*', '', response_text)
-        response_text = re.sub(r'```\s*$', '', response_text)
-        
         # Try to find JSON object in the response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            return json_match.group()
+        json_object = extract_json_object(response_text)
+        if json_object is not None:
+            return json_object
         
+        # Remove markdown code blocks if present
+        response_text = JSON_FENCE_OPEN_PATTERN.sub('', response_text)
+        response_text = JSON_FENCE_CLOSE_PATTERN.sub('', response_text)
         return response_text.strip()
     
-    def _analyze_grammar_enhanced(self, text: str) -> List[GrammarIssue]:
+    @staticmethod
+    def _analyze_grammar_enhanced(text: str) -> List[GrammarIssue]:
         """Minimal grammar analysis focused only on ATS-critical formatting"""
         issues = []
         
@@ -273,12 +559,7 @@ class AIAnalysisService:
         # Focus on formatting consistency that impacts ATS readability
         
         # Check for severely inconsistent bullet point formatting only
-        lines = text.split('\n')
-        bullet_formats = []
-        
-        for line in lines:
-            if re.match(r'^\s*[-*•]', line.strip()):
-                bullet_formats.append(line.strip()[0:3])
+        bullet_formats = extract_text_features(text).bullet_prefixes
         
         # Only flag if there are more than 2 different bullet formats (major inconsistency)
         if len(set(bullet_formats)) > 2 and len(bullet_formats) > 5:
@@ -307,62 +588,41 @@ class AIAnalysisService:
         }
         return suggestions.get(issue_type, 'Consider reviewing for ATS compatibility')
     
-    def _analyze_repetitions(self, text: str) -> List[RepetitionIssue]:
+    @staticmethod
+    def _analyze_repetitions(text: str) -> List[RepetitionIssue]:
         """Very lenient repetition analysis - only flag extreme overuse"""
-        words = re.findall(r'\b[a-zA-Z]{6,}\b', text.lower())  # Only words 6+ chars
-        word_count = {}
-        word_positions = {}
-        
-        for i, word in enumerate(words):
-            if word not in word_count:
-                word_count[word] = 0
-                word_positions[word] = []
-            word_count[word] += 1
-            word_positions[word].append(i)
-        
-        # Only flag words repeated more than 8 times (very lenient)
-        repetitions = []
-        for word, count in word_count.items():
-            if count > 8 and len(word) > 6:  # Very strict thresholds
-                repetitions.append({
-                    'word': word,
-                    'count': count,
-                    'positions': word_positions[word]
-                })
-        
-        # Limit to top 2 most repeated words only
-        repetitions = sorted(repetitions, key=lambda x: x['count'], reverse=True)[:2]
+        words = [word for word in tokenize(text) if len(word) >= 6]  # Only words 6+ chars
         
-        return [
-            RepetitionIssue(
-                word=rep['word'],
-                count=rep['count'],
-                positions=rep['positions']
-            )
-            for rep in repetitions
+        # Only flag words repeated more than 8 times (very lenient),
+        # limited to the top 2 most repeated words
+        flagged = [
+            (word, count)
+            for word, count in Counter(words).most_common()
+            if count > 8 and len(word) > 6  # Very strict thresholds
         ]
+        
+        # Positions aren't shown to users, so they're left out of the issue
+        return [RepetitionIssue(word=word, count=count) for word, count in flagged[:2]]
     
-    def _analyze_format(self, text: str) -> List[FormatIssue]:
+    @staticmethod
+    def _analyze_format(text: str) -> List[FormatIssue]:
         """Minimal format analysis focusing only on ATS-critical parsing issues"""
         issues = []
+        features = extract_text_features(text)
         
         # Only check for the most critical ATS parsing issues
         
         # Check for missing contact information (critical for ATS)
-        has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text))
-        
-        if not has_email:
+        if not features.has_email:
             issues.append({
                 'issue_type': 'ats_critical',
                 'description': 'Email address not clearly identifiable by ATS',
                 'suggestion': 'Ensure email address is clearly visible for ATS parsing'
             })
         
-        # Check for basic section structure (only if severely lacking)
-        has_experience_section = bool(re.search(r'\b(experience|work|employment|professional)\b', text, re.IGNORECASE))
-        has_skills_section = bool(re.search(r'\b(skills|competencies|technical)\b', text, re.IGNORECASE))
-        
-        if not (has_experience_section or has_skills_section):
+        # Check for basic section structure (only if severely lacking):
+        # no experience or skills section keywords at all
+        if not features.has_section_keywords:
             issues.append({
                 'issue_type': 'ats_structure',
                 'description': 'Missing clear section identifiers',
@@ -387,28 +647,25 @@ class AIAnalysisService:
                                readability_score: float) -> float:
         """Calculate overall ATS score based on all factors"""
         
+        grammar_count = len(grammar_issues)
+        repetition_count = len(repetition_issues)
+        format_count = len(format_issues)
+        
         # Debug logging to identify scoring issues
-        logger.info(f"Scoring Debug - JD Match: {jd_match}")
-        logger.info(f"Scoring Debug - Grammar Issues: {len(grammar_issues)}")
-        logger.info(f"Scoring Debug - Repetition Issues: {len(repetition_issues)}")
-        logger.info(f"Scoring Debug - Format Issues: {len(format_issues)}")
-        logger.info(f"Scoring Debug - Readability Score: {readability_score}")
-        
-        # Weight distribution - heavily emphasizing content relevance over language mechanics
-        weights = {
-            'jd_match': 0.70,     # 70% - Primary focus on job alignment
-            'grammar': 0.05,      # 5% - Minimal emphasis on grammar
-            'repetition': 0.05,   # 5% - Minimal emphasis on repetition
-            'format': 0.15,       # 15% - Structure remains important for ATS
-            'readability': 0.05   # 5% - Basic readability only
-        }
+        logger.debug("Scoring Debug - JD Match: %s", jd_match)
+        logger.debug("Scoring Debug - Grammar Issues: %s", grammar_count)
+        logger.debug("Scoring Debug - Repetition Issues: %s", repetition_count)
+        logger.debug("Scoring Debug - Format Issues: %s", format_count)
+        logger.debug("Scoring Debug - Readability Score: %s", readability_score)
+        
+        weights = SCORE_WEIGHTS
         
         # Calculate component scores with very lenient penalties for language mechanics
-        grammar_score = max(0, 100 - len(grammar_issues) * 3)  # Very minimal penalty: 3 per issue
-        repetition_score = max(0, 100 - len(repetition_issues) * 5)  # Very minimal penalty: 5 per issue
-        format_score = max(0, 100 - len(format_issues) * 8)  # Reduced penalty: 8 per issue
+        grammar_score = max(0, 100 - grammar_count * 3)  # Very minimal penalty: 3 per issue
+        repetition_score = max(0, 100 - repetition_count * 5)  # Very minimal penalty: 5 per issue
+        format_score = max(0, 100 - format_count * 8)  # Reduced penalty: 8 per issue
         
-        logger.info(f"Component Scores - Grammar: {grammar_score}, Repetition: {repetition_score}, Format: {format_score}")
+        logger.debug("Component Scores - Grammar: %s, Repetition: %s, Format: %s", grammar_score, repetition_score, format_score)
         
         # Calculate weighted average
         overall_score = (
@@ -419,26 +676,89 @@ class AIAnalysisService:
             readability_score * weights['readability']
         )
         
-        logger.info(f"Final calculated score: {overall_score}")
+        logger.debug("Final calculated score: %s", overall_score)
         
         return round(min(100, max(0, overall_score)), 2)
 
+def run_local_analyses(resume_text: str) -> LocalAnalysis:
+    """Run the analyses that don't need the AI model.
+    
+    Module-level, and free of the Gemini client, so worker processes can run it
+    without building an AIAnalysisService.
+    """
+    return LocalAnalysis(
+        grammar_issues=AIAnalysisService._analyze_grammar_enhanced(resume_text),
+        repetition_issues=AIAnalysisService._analyze_repetitions(resume_text),
+        format_issues=AIAnalysisService._analyze_format(resume_text),
+        readability_score=TextAnalyzer.calculate_readability_score(resume_text)
+    )
+
 class AnalysisCache:
-    """Simple in-memory cache for analysis results"""
+    """Bounded in-memory LRU cache for analysis results, with entries expiring after a TTL"""
     
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, capacity: Optional[int] = None, ttl: Optional[int] = None):
+        self._cache: "OrderedDict[str, Tuple[float, AnalysisResult]]" = OrderedDict()
+        self._capacity = capacity or int(os.getenv("ATS_CACHE_CAP", 1024))
+        self._ttl = ttl or int(os.getenv("ATS_CACHE_TTL", 3600))
+        self._lock = threading.Lock()
+        # Futures (and owning analysis IDs) for analyses currently running, so identical
+        # requests share one AI call
+        self._inflight: Dict[str, Tuple[asyncio.Future, Optional[str]]] = {}
+        self._inflight_lock = asyncio.Lock()
     
     def get(self, key: str) -> Optional[AnalysisResult]:
-        """Get cached analysis result"""
-        return self._cache.get(key)
+        """Get cached analysis result, marking it as most recently used"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
     
     def set(self, key: str, result: AnalysisResult) -> None:
-        """Cache analysis result"""
-        self._cache[key] = result
+        """Cache analysis result, evicting the least recently used entries"""
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self._ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+    
+    async def join_inflight(self, key: str,
+                            analysis_id: Optional[str] = None) -> Tuple[asyncio.Future, Optional[str], bool]:
+        """Get the future of an in-flight analysis, registering a new one (under analysis_id)
+        if there is none.
+        
+        Returns the future, the analysis ID its owner registered, and whether the caller
+        owns it (and must resolve it).
+        """
+        async with self._inflight_lock:
+            entry = self._inflight.get(key)
+            if entry is not None:
+                return entry[0], entry[1], False
+            
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = (future, analysis_id)
+            return future, analysis_id, True
+    
+    async def resolve_inflight(self, key: str, result: Optional[AnalysisResult] = None,
+                               error: Optional[BaseException] = None) -> None:
+        """Resolve and forget the in-flight future for key, waking any waiting requests"""
+        async with self._inflight_lock:
+            future, _ = self._inflight.pop(key, (None, None))
+        
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+            # Mark as retrieved so asyncio doesn't log it when no request was waiting
+            future.exception()
+        else:
+            future.set_result(result)
     
     def generate_cache_key(self, resume_text: str, job_description: str) -> str:
         """Generate cache key from resume and job description"""
-        import hashlib
-        content = f"{resume_text}{job_description}"
-        return hashlib.md5(content.encode()).hexdigest()
\ No newline at end of file
+        return analysis_key(resume_text, job_description)
\ No newline at end of file
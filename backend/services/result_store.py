@@ -0,0 +1,263 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from ..models.ats_models import AnalysisResult, AnalysisStatus
+except ImportError:
+    # For running standalone or tests
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from models.ats_models import AnalysisResult, AnalysisStatus
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESULT_KEY_PREFIX = "ats:result:"
+INPUT_KEY_PREFIX = "ats:input:"
+CACHE_KEY_PREFIX = "ats:cache:"
+INPUT_TTL = 3600
+STATS_KEY = "ats:stats"
+GRAMMAR_ISSUES_KEY = "ats:stats:grammar_issues"
+FORMAT_ISSUES_KEY = "ats:stats:format_issues"
+
+@dataclass
+class AnalysisStats:
+    """All-time analytics counters, updated as analyses complete.
+
+    Only ever incremented: deleting or expiring a result does not remove it from the counts.
+    """
+    total: int = 0
+    completed: int = 0
+    score_sum: float = 0.0
+    grammar_counter: Counter = field(default_factory=Counter)
+    format_counter: Counter = field(default_factory=Counter)
+
+class ResultStore:
+    """Analysis result storage shared across workers via Redis.
+
+    Falls back to a per-process dict when no Redis client is configured
+    (local development), bounded by max_results and expiring entries after
+    the same TTL. Analytics are kept as all-time running counters so the
+    summary never has to scan stored results.
+    """
+
+    def __init__(self, redis_client=None, ttl: int = 86400, max_results: int = 10000):
+        self._redis = redis_client
+        self._ttl = ttl
+        self._max_results = max_results
+        # (expires_at, result) in write order; with one TTL for all, the oldest entry expires first
+        self._results: "OrderedDict[str, Tuple[float, AnalysisResult]]" = OrderedDict()
+        self._payloads: Dict[str, bytes] = {}
+        self._inputs: Dict[str, Tuple[str, str]] = {}
+        self._stats = AnalysisStats()
+        self._stats_lock = asyncio.Lock()
+
+    def _get_local(self, analysis_id: str) -> Optional[AnalysisResult]:
+        """Get an in-memory result, dropping it if it has expired"""
+        entry = self._results.get(analysis_id)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            self._drop_local(analysis_id)
+            return None
+        return result
+
+    def _drop_local(self, analysis_id: str) -> bool:
+        """Remove an in-memory result, returning whether it existed"""
+        self._payloads.pop(analysis_id, None)
+        return self._results.pop(analysis_id, None) is not None
+
+    def _evict_local(self) -> None:
+        """Drop expired in-memory results and the oldest ones beyond max_results"""
+        now = time.monotonic()
+        while self._results:
+            analysis_id, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now and len(self._results) <= self._max_results:
+                break
+            self._drop_local(analysis_id)
+
+    async def get(self, analysis_id: str) -> Optional[AnalysisResult]:
+        """Get analysis result by ID"""
+        if self._redis is None:
+            return self._get_local(analysis_id)
+
+        payload = await self._redis.get(RESULT_KEY_PREFIX + analysis_id)
+        if payload is None:
+            return None
+        return AnalysisResult.model_validate_json(payload)
+
+    async def get_json(self, analysis_id: str) -> Optional[bytes]:
+        """Get analysis result as serialized JSON, skipping the model round-trip"""
+        if self._redis is None:
+            # Check expiry first; dropping an expired result drops its payload too
+            result = self._get_local(analysis_id)
+            if result is None:
+                return None
+            payload = self._payloads.get(analysis_id)
+            if payload is None:
+                payload = self._payloads[analysis_id] = result.model_dump_json(exclude_none=True).encode()
+            return payload
+
+        payload = await self._redis.get(RESULT_KEY_PREFIX + analysis_id)
+        return payload.encode() if payload is not None else None
+
+    async def get_many(self, analysis_ids: List[str]) -> Dict[str, Optional[AnalysisResult]]:
+        """Get several analysis results in one round-trip"""
+        if self._redis is None:
+            return {analysis_id: self._get_local(analysis_id) for analysis_id in analysis_ids}
+
+        if not analysis_ids:
+            return {}
+        payloads = await self._redis.mget([RESULT_KEY_PREFIX + analysis_id for analysis_id in analysis_ids])
+        return {
+            analysis_id: AnalysisResult.model_validate_json(payload) if payload is not None else None
+            for analysis_id, payload in zip(analysis_ids, payloads)
+        }
+
+    async def set(self, analysis_id: str, result: AnalysisResult) -> None:
+        """Store analysis result (expires after the configured TTL)"""
+        if self._redis is None:
+            self._results[analysis_id] = (time.monotonic() + self._ttl, result)
+            self._results.move_to_end(analysis_id)
+            self._payloads.pop(analysis_id, None)
+            self._evict_local()
+            return
+
+        await self._redis.set(RESULT_KEY_PREFIX + analysis_id, result.model_dump_json(exclude_none=True), ex=self._ttl)
+
+    async def delete(self, analysis_id: str) -> bool:
+        """Delete analysis result, returning whether it existed"""
+        if self._redis is None:
+            return self._drop_local(analysis_id)
+
+        return bool(await self._redis.delete(RESULT_KEY_PREFIX + analysis_id))
+
+    async def get_cached_analysis(self, cache_key: str) -> Optional[AnalysisResult]:
+        """Get an analysis cached by any worker (Redis only; local caching is AnalysisCache's job)"""
+        if self._redis is None:
+            return None
+
+        payload = await self._redis.get(CACHE_KEY_PREFIX + cache_key)
+        if payload is None:
+            return None
+        return AnalysisResult.model_validate_json(payload)
+
+    async def cache_analysis(self, cache_key: str, result: AnalysisResult) -> None:
+        """Share an analysis with all workers for the configured TTL"""
+        if self._redis is None:
+            return
+
+        await self._redis.set(CACHE_KEY_PREFIX + cache_key, result.model_dump_json(exclude_none=True), ex=self._ttl)
+
+    async def set_input(self, analysis_id: str, resume_text: str, job_description: str) -> None:
+        """Stage analysis input so background tasks only need to carry the ID"""
+        if self._redis is None:
+            self._inputs[analysis_id] = (resume_text, job_description)
+            return
+
+        payload = json.dumps([resume_text, job_description])
+        await self._redis.set(INPUT_KEY_PREFIX + analysis_id, payload, ex=INPUT_TTL)
+
+    async def get_input(self, analysis_id: str) -> Optional[Tuple[str, str]]:
+        """Fetch staged analysis input, leaving it in place for a redelivered task"""
+        if self._redis is None:
+            return self._inputs.get(analysis_id)
+
+        payload = await self._redis.get(INPUT_KEY_PREFIX + analysis_id)
+        if payload is None:
+            return None
+        resume_text, job_description = json.loads(payload)
+        return resume_text, job_description
+
+    async def delete_input(self, analysis_id: str) -> None:
+        """Remove staged analysis input once its result is stored"""
+        if self._redis is None:
+            self._inputs.pop(analysis_id, None)
+            return
+
+        await self._redis.delete(INPUT_KEY_PREFIX + analysis_id)
+
+    async def record_started(self) -> None:
+        """Count a newly submitted analysis"""
+        if self._redis is None:
+            async with self._stats_lock:
+                self._stats.total += 1
+            return
+
+        await self._redis.hincrby(STATS_KEY, "total", 1)
+
+    async def record_completed(self, result: AnalysisResult) -> None:
+        """Fold a completed analysis into the running analytics counters"""
+        if result.status != AnalysisStatus.COMPLETED:
+            return
+
+        if self._redis is None:
+            async with self._stats_lock:
+                self._stats.completed += 1
+                self._stats.score_sum += result.percentage_score
+                self._stats.grammar_counter.update(issue.text for issue in result.grammar_mistakes)
+                self._stats.format_counter.update(issue.issue_type for issue in result.format_issues)
+            return
+
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hincrby(STATS_KEY, "completed", 1)
+        pipe.hincrbyfloat(STATS_KEY, "score_sum", result.percentage_score)
+        for issue in result.grammar_mistakes:
+            pipe.zincrby(GRAMMAR_ISSUES_KEY, 1, issue.text)
+        for issue in result.format_issues:
+            pipe.zincrby(FORMAT_ISSUES_KEY, 1, issue.issue_type)
+        await pipe.execute()
+
+    async def get_stats(self, top_issues: int = 5) -> AnalysisStats:
+        """Get a snapshot of the analytics counters.
+
+        Only the top_issues most frequent grammar issues are included.
+        """
+        if self._redis is None:
+            async with self._stats_lock:
+                return AnalysisStats(
+                    total=self._stats.total,
+                    completed=self._stats.completed,
+                    score_sum=self._stats.score_sum,
+                    grammar_counter=Counter(dict(self._stats.grammar_counter.most_common(top_issues))),
+                    format_counter=Counter(self._stats.format_counter)
+                )
+
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hgetall(STATS_KEY)
+        pipe.zrevrange(GRAMMAR_ISSUES_KEY, 0, top_issues - 1, withscores=True)
+        pipe.zrevrange(FORMAT_ISSUES_KEY, 0, -1, withscores=True)
+        stats, grammar_issues, format_issues = await pipe.execute()
+
+        return AnalysisStats(
+            total=int(stats.get("total", 0)),
+            completed=int(stats.get("completed", 0)),
+            score_sum=float(stats.get("score_sum", 0.0)),
+            grammar_counter=Counter({text: int(count) for text, count in grammar_issues}),
+            format_counter=Counter({issue: int(count) for issue, count in format_issues})
+        )
+
+    async def close(self) -> None:
+        """Close the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.aclose()
+
+def create_result_store() -> ResultStore:
+    """Create result store, using Redis when REDIS_URL is configured"""
+    ttl = int(os.getenv("ATS_RESULT_TTL", 86400))
+    redis_url = os.getenv("REDIS_URL")
+
+    if not redis_url:
+        logger.warning("REDIS_URL not set, storing analysis results in process memory")
+        return ResultStore(ttl=ttl, max_results=int(os.getenv("ATS_RESULTS_MAX", 10000)))
+
+    import redis.asyncio as redis
+    return ResultStore(redis.from_url(redis_url, decode_responses=True), ttl=ttl)
@@ -1,82 +1,164 @@
 import PyPDF2
 import docx
+try:
+    # PDFium-backed text extraction, several times faster than PyPDF2
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 import re
 import logging
-from typing import Optional, Dict, List
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import Optional, Dict, List, Tuple, Union, BinaryIO
 from io import BytesIO
-import tempfile
 import os
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PDFium is not thread-safe, and uploads are parsed on worker threads
+PDFIUM_LOCK = threading.Lock()
+
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+@lru_cache(maxsize=64)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Lowercased words of 3+ letters, cached so each text is only scanned once per analysis.
+    
+    Callers needing longer words filter by length, which matches the stricter pattern.
+    Only the matched words are lowercased, rather than a copy of the whole text.
+    """
+    return tuple(map(str.lower, WORD_PATTERN.findall(text)))
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+SECTION_PATTERN = re.compile(
+    r'\b(experience|work|employment|professional|skills|competencies|technical)\b', re.IGNORECASE
+)
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+WORD_RUN_PATTERN = re.compile(r'\w+')  # Same matches as \b\w+\b
+BULLET_CHARS = ('-', '*', '•')
+# Basic grammar checks as one alternation, each group named after its issue type.
+# Issues are reported per line, so a missing period across a line break is never flagged.
+GRAMMAR_PATTERN = re.compile(r'(?P<double_space>  +)|(?P<missing_capitalization>\. [a-z])')
+GRAMMAR_ISSUE_TYPES = tuple(GRAMMAR_PATTERN.groupindex)
+LINE_BREAK_PATTERN = re.compile(r'\n')
+# Bulleted, numbered and lettered list markers at the start of the text
+LIST_MARKER_PATTERNS = (
+    re.compile(r'^\s*[-*•]\s'),
+    re.compile(r'^\s*\d+\.\s'),
+    re.compile(r'^\s*[a-zA-Z]\.\s')
+)
+
+@dataclass(frozen=True)
+class TextFeatures:
+    """Text measurements shared by the grammar, format and readability analyses"""
+    bullet_prefixes: Tuple[str, ...]
+    has_email: bool
+    has_section_keywords: bool
+    sentence_count: int
+    word_count: int
+    char_count: int  # Non-whitespace characters
+
+@lru_cache(maxsize=64)
+def extract_text_features(text: str) -> TextFeatures:
+    """Measure text in one go, cached so each analysis reuses the same scan"""
+    bullet_prefixes = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith(BULLET_CHARS):
+            bullet_prefixes.append(stripped[:3])
+    
+    return TextFeatures(
+        bullet_prefixes=tuple(bullet_prefixes),
+        has_email=EMAIL_PATTERN.search(text) is not None,
+        has_section_keywords=SECTION_PATTERN.search(text) is not None,
+        sentence_count=len(SENTENCE_END_PATTERN.findall(text)),
+        word_count=len(WORD_RUN_PATTERN.findall(text)),
+        char_count=len(''.join(text.split()))
+    )
+
 class DocumentParser:
     """Enhanced document parser supporting PDF and DOCX formats with error handling"""
     
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> Optional[str]:
+    def extract_text_from_pdf(file_content: Union[bytes, BinaryIO]) -> Optional[str]:
         """Extract text from PDF file with enhanced error handling"""
+        pdf_stream = BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+        
+        if pdfium is not None:
+            try:
+                return DocumentParser._extract_text_with_pdfium(pdf_stream)
+            except Exception as e:
+                logger.warning("PDFium failed to parse PDF, falling back to PyPDF2: %s", e)
+                pdf_stream.seek(0)
+        
         try:
-            pdf_stream = BytesIO(file_content)
             reader = PyPDF2.PdfReader(pdf_stream)
             
-            text = ""
+            page_texts = []
             for page_num, page in enumerate(reader.pages):
                 try:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
+                        page_texts.append(page_text)
                 except Exception as e:
-                    logger.warning(f"Error extracting text from page {page_num}: {str(e)}")
+                    logger.warning("Error extracting text from page %s: %s", page_num, e)
                     continue
             
-            return text.strip() if text.strip() else None
+            text = "\n".join(page_texts).strip()
+            return text if text else None
             
         except Exception as e:
-            logger.error(f"Error parsing PDF: {str(e)}")
+            logger.error("Error parsing PDF: %s", e)
             return None
     
     @staticmethod
-    def extract_text_from_docx(file_content: bytes) -> Optional[str]:
+    def _extract_text_with_pdfium(pdf_stream: BinaryIO) -> Optional[str]:
+        """Extract text from PDF with PDFium (raises on documents it can't open)"""
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_stream)
+            try:
+                page_texts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    page_texts.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        
+        # PDFium separates lines with CRLF
+        text = "\n".join(page_texts).replace("\r\n", "\n").strip()
+        return text if text else None
+    
+    @staticmethod
+    def extract_text_from_docx(file_content: Union[bytes, BinaryIO]) -> Optional[str]:
         """Extract text from DOCX file with enhanced error handling"""
         try:
-            # Create a temporary file to store the content
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+            docx_stream = BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+            doc = docx.Document(docx_stream)
+            
+            # Extract text from paragraphs, then tables (python-docx rebuilds .text on every access)
+            paragraph_texts = (paragraph.text for paragraph in doc.paragraphs)
+            cell_texts = (cell.text for table in doc.tables for row in table.rows for cell in row.cells)
+            text_parts = [part for part in map(str.strip, chain(paragraph_texts, cell_texts)) if part]
+            
+            text = "\n".join(text_parts)
+            return text if text else None
             
-            try:
-                doc = docx.Document(temp_file_path)
-                text_parts = []
-                
-                # Extract text from paragraphs
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        text_parts.append(paragraph.text.strip())
-                
-                # Extract text from tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                text_parts.append(cell.text.strip())
-                
-                text = "\n".join(text_parts)
-                return text.strip() if text.strip() else None
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    
         except Exception as e:
-            logger.error(f"Error parsing DOCX: {str(e)}")
+            logger.error("Error parsing DOCX: %s", e)
             return None
     
     @staticmethod
-    def parse_document(file_content: bytes, file_type: str) -> Optional[str]:
-        """Parse document based on file type"""
+    def parse_document(file_content: Union[bytes, BinaryIO], file_type: str) -> Optional[str]:
+        """Parse document (raw bytes or a binary file object) based on file type"""
         file_type = file_type.lower()
         
         if file_type == 'pdf':
@@ -84,37 +166,70 @@ class DocumentParser:
         elif file_type == 'docx':
             return DocumentParser.extract_text_from_docx(file_content)
         else:
-            logger.error(f"Unsupported file type: {file_type}")
+            logger.error("Unsupported file type: %s", file_type)
             return None
 
+class ParseCache:
+    """Bounded LRU cache of extracted document text, keyed by file content hash"""
+    
+    def __init__(self, capacity: Optional[int] = None):
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._capacity = capacity or int(os.getenv("ATS_PARSE_CACHE_CAP", 256))
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get cached text, marking it as most recently used"""
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+            return text
+    
+    def set(self, key: str, text: str) -> None:
+        """Cache extracted text, evicting the least recently used entries"""
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+    
+    @staticmethod
+    def content_hasher():
+        """Create the hasher used for file content, so uploads can be hashed chunk by chunk"""
+        return hashlib.blake2b(digest_size=16)
+    
+    @staticmethod
+    def generate_cache_key(file_digest: str, file_type: str) -> str:
+        """Generate cache key from the file content digest and type"""
+        return f"{file_type.lower()}:{file_digest}"
+
 class TextAnalyzer:
     """Text analysis utilities for grammar, repetition, and format checking"""
     
     @staticmethod
     def analyze_grammar(text: str) -> List[Dict]:
         """Basic grammar analysis - can be enhanced with external libraries"""
-        issues = []
-        lines = text.split('\n')
-        
-        # Basic grammar patterns to check
-        patterns = {
-            'double_space': r'  +',
-            'missing_capitalization': r'\. [a-z]',
-            'missing_period': r'[a-zA-Z]\n[A-Z]',
-        }
+        matches = list(GRAMMAR_PATTERN.finditer(text))
+        if not matches:
+            return []
         
-        for line_num, line in enumerate(lines, 1):
-            for issue_type, pattern in patterns.items():
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issues.append({
-                        'text': match.group(),
-                        'line_number': line_num,
-                        'suggestion': TextAnalyzer._get_grammar_suggestion(issue_type),
-                        'severity': 'medium'
-                    })
+        # Line numbers from match offsets; issues are listed by line, then by check
+        line_breaks = [match.start() for match in LINE_BREAK_PATTERN.finditer(text)]
+        located = [
+            (bisect_right(line_breaks, match.start()) + 1, GRAMMAR_ISSUE_TYPES.index(match.lastgroup), match)
+            for match in matches
+        ]
+        located.sort(key=lambda item: item[:2])
         
-        return issues
+        return [
+            {
+                'text': match.group(),
+                'line_number': line_num,
+                'suggestion': TextAnalyzer._get_grammar_suggestion(match.lastgroup),
+                'severity': 'medium'
+            }
+            for line_num, _, match in located
+        ]
     
     @staticmethod
     def _get_grammar_suggestion(issue_type: str) -> str:
@@ -129,28 +244,25 @@ class TextAnalyzer:
     @staticmethod
     def analyze_word_repetition(text: str) -> List[Dict]:
         """Analyze word repetition in the text"""
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        word_count = {}
-        word_positions = {}
+        words = tokenize(text)
+        
+        # Find words repeated more than reasonable threshold, most repeated first
+        repeated = {
+            word: []
+            for word, count in Counter(words).most_common()
+            if count > 3 and len(word) > 4  # Configurable thresholds
+        }
         
+        # Collect positions only for the flagged words
         for i, word in enumerate(words):
-            if word not in word_count:
-                word_count[word] = 0
-                word_positions[word] = []
-            word_count[word] += 1
-            word_positions[word].append(i)
-        
-        # Find words repeated more than reasonable threshold
-        repetitions = []
-        for word, count in word_count.items():
-            if count > 3 and len(word) > 4:  # Configurable thresholds
-                repetitions.append({
-                    'word': word,
-                    'count': count,
-                    'positions': word_positions[word]
-                })
-        
-        return sorted(repetitions, key=lambda x: x['count'], reverse=True)
+            positions = repeated.get(word)
+            if positions is not None:
+                positions.append(i)
+        
+        return [
+            {'word': word, 'count': len(positions), 'positions': positions}
+            for word, positions in repeated.items()
+        ]
     
     @staticmethod
     def analyze_format_issues(text: str) -> List[Dict]:
@@ -176,8 +288,7 @@ class TextAnalyzer:
             })
         
         # Check for bullet point consistency
-        bullet_patterns = [r'^\s*[-*•]\s', r'^\s*\d+\.\s', r'^\s*[a-zA-Z]\.\s']
-        bullet_usage = sum(len(re.findall(pattern, text)) for pattern in bullet_patterns)
+        bullet_usage = sum(len(pattern.findall(text)) for pattern in LIST_MARKER_PATTERNS)
         if bullet_usage < 3 and len(text) > 500:
             issues.append({
                 'issue_type': 'structure',
@@ -190,13 +301,14 @@ class TextAnalyzer:
     @staticmethod
     def calculate_readability_score(text: str) -> float:
         """Calculate a basic readability score (0-100) optimized for resumes"""
-        if not text.strip():
+        if not text or text.isspace():
             return 0.0
         
         # Basic metrics
-        sentences = len(re.findall(r'[.!?]+', text))
-        words = len(re.findall(r'\b\w+\b', text))
-        characters = len(re.sub(r'\s', '', text))
+        features = extract_text_features(text)
+        sentences = features.sentence_count
+        words = features.word_count
+        characters = features.char_count
         
         if sentences == 0 or words == 0:
             return 65.0  # Default reasonable score for bullet-heavy resumes
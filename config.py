@@ -19,10 +19,10 @@ class Config:
     # File Upload Configuration
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
-    ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+    ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx'})
     
     # CORS Configuration
-    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5000,http://127.0.0.1:5000').split(',')
+    CORS_ORIGINS = tuple(os.environ.get('CORS_ORIGINS', 'http://localhost:5000,http://127.0.0.1:5000').split(','))
     
     # Analysis Configuration
     ANALYSIS_TIMEOUT = int(os.environ.get('ANALYSIS_TIMEOUT', 300))  # 5 minutes
@@ -1,10 +1,16 @@
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, Response, render_template, request, flash, redirect, url_for
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+import hashlib
 import os
 import logging
 from werkzeug.utils import secure_filename
 import time
 import json
+import uuid
+from functools import lru_cache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,7 +22,27 @@ app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-product
 # Configuration
 BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:8000')
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx'})
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when forwarding uploads
+RELAY_CHUNK_SIZE = 8 * 1024  # Bytes relayed at a time when streaming backend responses
+
+# Client-facing messages, shared with the ASGI frontend so both proxies answer alike
+NO_FILE_UPLOADED = 'No file uploaded'
+NO_FILE_SELECTED = 'No file selected'
+JOB_DESCRIPTION_REQUIRED = 'Job description is required'
+INVALID_FILE_FORMAT = 'Invalid file format. Please upload PDF or DOCX files only.'
+FILE_TOO_LARGE = 'File too large. Please upload a file smaller than 16MB.'
+ANALYSIS_FAILED = 'Analysis failed. Please try again.'
+ANALYSIS_TIMED_OUT = 'Analysis timed out. Please try again with a smaller file.'
+UPLOAD_BACKEND_UNAVAILABLE = 'Backend service unavailable. Please try again later.'
+UNEXPECTED_ERROR = 'An unexpected error occurred. Please try again.'
+ANALYSIS_NOT_FOUND = 'Analysis not found'
+ANALYSIS_RETRIEVAL_FAILED = 'Failed to retrieve analysis'
+BACKEND_UNAVAILABLE = 'Backend service unavailable'
+STATUS_FAILED = 'Failed to get status'
+STATUS_CHECK_FAILED = 'Status check failed'
+ANALYTICS_FAILED = 'Failed to get analytics'
+ANALYTICS_UNAVAILABLE = 'Analytics unavailable'
 
 # Ensure backend URL doesn't end with slash
 if BACKEND_URL.endswith('/'):
@@ -24,9 +50,105 @@ if BACKEND_URL.endswith('/'):
 
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+# Shared connection pool to the backend, so proxied calls reuse TCP/TLS connections.
+# Idempotent requests are retried on gateway errors; uploads are never resent.
+BACKEND_CONNECT_TIMEOUT = 3.0
+backend_session = requests.Session()
+backend_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+)
+backend_session.mount('http://', backend_adapter)
+backend_session.mount('https://', backend_adapter)
+atexit.register(backend_session.close)
+
+def multipart_upload_body(boundary, file, job_description):
+    """Yield the multipart/form-data body for the backend, reading the upload in chunks"""
+    # Quote the filename the way browsers do (HTML5 form encoding)
+    filename = file.filename.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+    yield (
+        f'--{boundary}\r\n'
+        'Content-Disposition: form-data; name="job_description"\r\n\r\n'
+        f'{job_description}\r\n'
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="resume_file"; filename="{filename}"\r\n'
+        f'Content-Type: {file.content_type or "application/octet-stream"}\r\n\r\n'
+    ).encode()
+    while True:
+        chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+@lru_cache(maxsize=None)
+def failure_body(message):
+    """Serialized {'success': False} body; messages are fixed strings, so each is built once"""
+    return json.dumps({'success': False, 'message': message}).encode()
+
+def failure_response(message, status):
+    """JSON failure response for the upload and analysis routes"""
+    return Response(failure_body(message), status=status, mimetype='application/json')
+
+@lru_cache(maxsize=None)
+def error_body(message):
+    """Serialized {'error': ...} body, built once per message"""
+    return json.dumps({'error': message}).encode()
+
+def error_response(message, status):
+    """JSON error response for the status and analytics routes"""
+    return Response(error_body(message), status=status, mimetype='application/json')
+
+def backend_json(response):
+    """Pass a backend JSON body through without decoding and re-encoding it"""
+    return Response(response.content, mimetype='application/json')
+
+def conditional_headers():
+    """Forward the client's If-None-Match so the backend can answer 304 itself"""
+    if_none_match = request.headers.get('If-None-Match')
+    return {'If-None-Match': if_none_match} if if_none_match else None
+
+def stream_body(response):
+    """Yield a streamed backend body chunk by chunk, releasing the connection when done"""
+    try:
+        yield from response.iter_content(RELAY_CHUNK_SIZE)
+    finally:
+        response.close()
+
+def relay_json(response):
+    """Relay a backend JSON response with an ETag, answering 304 when the client's copy is current.
+    
+    Bodies that already carry the backend's ETag are streamed through chunked rather than buffered.
+    """
+    backend_etag = response.headers.get('ETag')
+    etag = backend_etag or f'"{hashlib.blake2b(response.content, digest_size=16).hexdigest()}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}  # Cache, but revalidate every time
+    
+    if_none_match = request.headers.get('If-None-Match')
+    if response.status_code == 304 or (if_none_match and etag in (tag.strip() for tag in if_none_match.split(','))):
+        response.close()
+        return Response(status=304, headers=headers)
+    if backend_etag:
+        return Response(stream_body(response), mimetype='application/json', headers=headers)
+    return Response(response.content, mimetype='application/json', headers=headers)
+
 def allowed_file(filename):
     """Check if file has allowed extension"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
+
+def upload_error(filename, job_description):
+    """Validate an upload (filename is None when no file was sent), returning the failure message or None"""
+    if filename is None:
+        return NO_FILE_UPLOADED
+    if not filename:
+        return NO_FILE_SELECTED
+    if not job_description.strip():
+        return JOB_DESCRIPTION_REQUIRED
+    if not allowed_file(filename):
+        return INVALID_FILE_FORMAT
+    return None
 
 @app.route('/')
 def index():
@@ -47,116 +169,98 @@ def about():
 def upload_resume():
     """Handle resume upload and analysis"""
     try:
-        # Check if file is in request
-        if 'resume' not in request.files:
-            return jsonify({'success': False, 'message': 'No file uploaded'}), 400
-        
-        file = request.files['resume']
+        file = request.files.get('resume')
         job_description = request.form.get('job_description', '')
         
         # Validate inputs
-        if file.filename == '':
-            return jsonify({'success': False, 'message': 'No file selected'}), 400
-        
-        if not job_description.strip():
-            return jsonify({'success': False, 'message': 'Job description is required'}), 400
+        error = upload_error(file.filename if file is not None else None, job_description)
+        if error:
+            return failure_response(error, 400)
         
-        if not allowed_file(file.filename):
-            return jsonify({
-                'success': False, 
-                'message': 'Invalid file format. Please upload PDF or DOCX files only.'
-            }), 400
-        
-        # Prepare file for backend
-        files = {'resume_file': (file.filename, file.read(), file.content_type)}
-        data = {'job_description': job_description}
-        
-        # Send to backend
-        response = requests.post(
+        # Stream the file to the backend instead of reading it into memory
+        boundary = uuid.uuid4().hex
+        response = backend_session.post(
             f'{BACKEND_URL}/api/analyze-resume',
-            files=files,
-            data=data,
-            timeout=120
+            data=multipart_upload_body(boundary, file, job_description),
+            headers={'Content-Type': f'multipart/form-data; boundary={boundary}'},
+            timeout=(BACKEND_CONNECT_TIMEOUT, 120)
         )
         
         if response.status_code == 200:
-            result = response.json()
-            return jsonify(result)
+            return backend_json(response)
         else:
-            logger.error(f"Backend error: {response.status_code} - {response.text}")
-            return jsonify({
-                'success': False, 
-                'message': 'Analysis failed. Please try again.'
-            }), 500
+            logger.error("Backend error: %s - %s", response.status_code, response.text)
+            return failure_response(ANALYSIS_FAILED, 500)
             
     except requests.exceptions.Timeout:
-        return jsonify({
-            'success': False, 
-            'message': 'Analysis timed out. Please try again with a smaller file.'
-        }), 408
+        return failure_response(ANALYSIS_TIMED_OUT, 408)
     except requests.exceptions.ConnectionError:
-        return jsonify({
-            'success': False, 
-            'message': 'Backend service unavailable. Please try again later.'
-        }), 503
+        return failure_response(UPLOAD_BACKEND_UNAVAILABLE, 503)
     except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
-        return jsonify({
-            'success': False, 
-            'message': 'An unexpected error occurred. Please try again.'
-        }), 500
+        logger.error("Upload error: %s", e)
+        return failure_response(UNEXPECTED_ERROR, 500)
 
 @app.route('/api/analysis/<analysis_id>')
 def get_analysis(analysis_id):
     """Get analysis result by ID"""
     try:
-        response = requests.get(f'{BACKEND_URL}/api/analysis/{analysis_id}', timeout=30)
+        response = backend_session.get(
+            f'{BACKEND_URL}/api/analysis/{analysis_id}',
+            headers=conditional_headers(),
+            timeout=(BACKEND_CONNECT_TIMEOUT, 30),
+            stream=True
+        )
         
-        if response.status_code == 200:
-            return jsonify(response.json())
-        elif response.status_code == 404:
-            return jsonify({'success': False, 'message': 'Analysis not found'}), 404
+        if response.status_code in (200, 304):
+            return relay_json(response)
+        
+        response.close()
+        if response.status_code == 404:
+            return failure_response(ANALYSIS_NOT_FOUND, 404)
         else:
-            return jsonify({'success': False, 'message': 'Failed to retrieve analysis'}), 500
+            return failure_response(ANALYSIS_RETRIEVAL_FAILED, 500)
             
     except requests.exceptions.ConnectionError:
-        return jsonify({
-            'success': False, 
-            'message': 'Backend service unavailable'
-        }), 503
+        return failure_response(BACKEND_UNAVAILABLE, 503)
     except Exception as e:
-        logger.error(f"Get analysis error: {str(e)}")
-        return jsonify({'success': False, 'message': 'Failed to retrieve analysis'}), 500
+        logger.error("Get analysis error: %s", e)
+        return failure_response(ANALYSIS_RETRIEVAL_FAILED, 500)
 
 @app.route('/api/analysis/<analysis_id>/status')
 def get_analysis_status(analysis_id):
     """Get analysis status"""
     try:
-        response = requests.get(f'{BACKEND_URL}/api/analysis/{analysis_id}/status', timeout=10)
+        response = backend_session.get(f'{BACKEND_URL}/api/analysis/{analysis_id}/status', timeout=(BACKEND_CONNECT_TIMEOUT, 10))
         
         if response.status_code == 200:
-            return jsonify(response.json())
+            return backend_json(response)
         else:
-            return jsonify({'error': 'Failed to get status'}), 500
+            return error_response(STATUS_FAILED, 500)
             
     except Exception as e:
-        logger.error(f"Status check error: {str(e)}")
-        return jsonify({'error': 'Status check failed'}), 500
+        logger.error("Status check error: %s", e)
+        return error_response(STATUS_CHECK_FAILED, 500)
 
 @app.route('/api/analytics/summary')
 def get_analytics_summary():
     """Get analytics summary from backend"""
     try:
-        response = requests.get(f'{BACKEND_URL}/api/analytics/summary', timeout=30)
+        response = backend_session.get(
+            f'{BACKEND_URL}/api/analytics/summary',
+            headers=conditional_headers(),
+            timeout=(BACKEND_CONNECT_TIMEOUT, 30),
+            stream=True
+        )
         
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
-            return jsonify({'error': 'Failed to get analytics'}), 500
+        if response.status_code in (200, 304):
+            return relay_json(response)
+        
+        response.close()
+        return error_response(ANALYTICS_FAILED, 500)
             
     except Exception as e:
-        logger.error(f"Analytics error: {str(e)}")
-        return jsonify({'error': 'Analytics unavailable'}), 500
+        logger.error("Analytics error: %s", e)
+        return error_response(ANALYTICS_UNAVAILABLE, 500)
 
 @app.route('/results/<analysis_id>')
 def results(analysis_id):
@@ -166,10 +270,7 @@ def results(analysis_id):
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
-    return jsonify({
-        'success': False, 
-        'message': 'File too large. Please upload a file smaller than 16MB.'
-    }), 413
+    return failure_response(FILE_TOO_LARGE, 413)
 
 @app.errorhandler(404)
 def not_found(e):
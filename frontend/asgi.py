@@ -0,0 +1,263 @@
+"""ASGI entry point for the frontend.
+
+The backend proxy routes run as async handlers on a shared httpx connection pool, so one
+process can hold many slow analyses open at once. Pages and static files are served here
+too, from the Flask app's templates, so every request goes through a single router.
+
+Run with: uvicorn frontend.asgi:app --port 5000
+(main.py runs it with the backend in the same process for integrated deployments)
+"""
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import HTMLResponse, Response
+from fastapi.staticfiles import StaticFiles
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from typing import Dict, Optional
+import hashlib
+import httpx
+import logging
+import os
+try:
+    # Lets httpx negotiate HTTP/2 with TLS backends, multiplexing requests on one connection
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Validation, client-facing messages and failure bodies come from the Flask app, so the two
+# frontends answer alike
+try:
+    from .app import (
+        app as flask_app, BACKEND_URL, MAX_CONTENT_LENGTH, upload_error, failure_body, error_body,
+        FILE_TOO_LARGE, ANALYSIS_FAILED, ANALYSIS_TIMED_OUT, UPLOAD_BACKEND_UNAVAILABLE, UNEXPECTED_ERROR,
+        ANALYSIS_NOT_FOUND, ANALYSIS_RETRIEVAL_FAILED, BACKEND_UNAVAILABLE, STATUS_FAILED,
+        STATUS_CHECK_FAILED, ANALYTICS_FAILED, ANALYTICS_UNAVAILABLE
+    )
+except ImportError:
+    # For running from the frontend directory
+    from app import (
+        app as flask_app, BACKEND_URL, MAX_CONTENT_LENGTH, upload_error, failure_body, error_body,
+        FILE_TOO_LARGE, ANALYSIS_FAILED, ANALYSIS_TIMED_OUT, UPLOAD_BACKEND_UNAVAILABLE, UNEXPECTED_ERROR,
+        ANALYSIS_NOT_FOUND, ANALYSIS_RETRIEVAL_FAILED, BACKEND_UNAVAILABLE, STATUS_FAILED,
+        STATUS_CHECK_FAILED, ANALYTICS_FAILED, ANALYTICS_UNAVAILABLE
+    )
+
+logger = logging.getLogger(__name__)
+
+# Paths of the pages the shared templates link to by Flask endpoint name
+PAGE_PATHS = {'index': '/', 'dashboard': '/dashboard', 'about': '/about'}
+
+def page_url(endpoint: str, **values) -> str:
+    """Flask-style url_for for the shared templates"""
+    if endpoint == 'static':
+        return f"/static/{values['filename']}"
+    return PAGE_PATHS[endpoint]
+
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(flask_app.root_path, flask_app.template_folder)),
+    autoescape=select_autoescape()
+)
+# The frontend never flashes messages, so the base template's message list is always empty
+templates.globals.update(url_for=page_url, get_flashed_messages=lambda with_categories=False: [])
+
+@lru_cache(maxsize=None)
+def render_page(name: str) -> str:
+    """Render a template without per-request context once, then serve the cached HTML"""
+    return templates.get_template(name).render()
+
+backend_client: httpx.AsyncClient = None
+# Backend ASGI app called in-process instead of over HTTP, see use_inprocess_backend
+inprocess_backend = None
+
+def use_inprocess_backend(backend_app) -> None:
+    """Serve backend calls from backend_app in this process, skipping the loopback socket"""
+    global inprocess_backend
+    inprocess_backend = backend_app
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the backend client for the lifetime of the app"""
+    global backend_client
+    timeout = httpx.Timeout(120.0, connect=3.0)
+    
+    if inprocess_backend is None:
+        backend_client = httpx.AsyncClient(
+            base_url=BACKEND_URL,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=timeout,
+            http2=HTTP2_AVAILABLE
+        )
+        try:
+            yield
+        finally:
+            await backend_client.aclose()
+        return
+    
+    # Run the backend's own startup and shutdown hooks alongside ours
+    async with inprocess_backend.router.lifespan_context(inprocess_backend):
+        backend_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=inprocess_backend),
+            base_url="http://backend",
+            timeout=timeout
+        )
+        try:
+            yield
+        finally:
+            await backend_client.aclose()
+
+app = FastAPI(title="Smart ATS Frontend", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+
+def failure_response(message: str, status_code: int) -> Response:
+    """JSON failure response for the upload and analysis routes"""
+    return Response(content=failure_body(message), status_code=status_code, media_type="application/json")
+
+def error_response(message: str, status_code: int) -> Response:
+    """JSON error response for the status and analytics routes"""
+    return Response(content=error_body(message), status_code=status_code, media_type="application/json")
+
+def backend_json(response: httpx.Response) -> Response:
+    """Pass a backend JSON body through without re-encoding it"""
+    return Response(content=response.content, media_type="application/json")
+
+def conditional_headers(request: Request) -> Optional[Dict[str, str]]:
+    """Forward the client's If-None-Match so the backend can answer 304 itself"""
+    if_none_match = request.headers.get('if-none-match')
+    return {'If-None-Match': if_none_match} if if_none_match else None
+
+def relay_json(request: Request, response: httpx.Response) -> Response:
+    """Relay a backend JSON response with an ETag, answering 304 when the client's copy is current"""
+    etag = response.headers.get('etag') or f'"{hashlib.blake2b(response.content, digest_size=16).hexdigest()}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}  # Cache, but revalidate every time
+    
+    if_none_match = request.headers.get('if-none-match')
+    if response.status_code == 304 or (if_none_match and etag in (tag.strip() for tag in if_none_match.split(','))):
+        return Response(status_code=304, headers=headers)
+    return Response(content=response.content, media_type="application/json", headers=headers)
+
+@app.post("/api/upload")
+async def upload_resume(resume: UploadFile = File(None), job_description: str = Form('')):
+    """Handle resume upload and analysis"""
+    try:
+        # Oversized uploads are rejected first, as Flask does for MAX_CONTENT_LENGTH
+        if resume is not None and resume.size is not None and resume.size > MAX_CONTENT_LENGTH:
+            return failure_response(FILE_TOO_LARGE, 413)
+        
+        # Validate inputs
+        error = upload_error(resume.filename if resume is not None else None, job_description)
+        if error:
+            return failure_response(error, 400)
+        
+        # Send the spooled upload to the backend without reading it into memory
+        response = await backend_client.post(
+            '/api/analyze-resume',
+            files={'resume_file': (resume.filename, resume.file, resume.content_type)},
+            data={'job_description': job_description}
+        )
+        
+        if response.status_code == 200:
+            return backend_json(response)
+        
+        logger.error("Backend error: %s - %s", response.status_code, response.text)
+        return failure_response(ANALYSIS_FAILED, 500)
+    
+    except httpx.TimeoutException:
+        return failure_response(ANALYSIS_TIMED_OUT, 408)
+    except httpx.ConnectError:
+        return failure_response(UPLOAD_BACKEND_UNAVAILABLE, 503)
+    except Exception as e:
+        logger.error("Upload error: %s", e)
+        return failure_response(UNEXPECTED_ERROR, 500)
+
+@app.get("/api/analysis/{analysis_id}")
+async def get_analysis(analysis_id: str, request: Request):
+    """Get analysis result by ID"""
+    try:
+        response = await backend_client.get(
+            f'/api/analysis/{analysis_id}',
+            headers=conditional_headers(request),
+            timeout=httpx.Timeout(30.0, connect=3.0)
+        )
+        
+        if response.status_code in (200, 304):
+            return relay_json(request, response)
+        elif response.status_code == 404:
+            return failure_response(ANALYSIS_NOT_FOUND, 404)
+        else:
+            return failure_response(ANALYSIS_RETRIEVAL_FAILED, 500)
+    
+    except httpx.ConnectError:
+        return failure_response(BACKEND_UNAVAILABLE, 503)
+    except Exception as e:
+        logger.error("Get analysis error: %s", e)
+        return failure_response(ANALYSIS_RETRIEVAL_FAILED, 500)
+
+@app.get("/api/analysis/{analysis_id}/status")
+async def get_analysis_status(analysis_id: str):
+    """Get analysis status"""
+    try:
+        response = await backend_client.get(f'/api/analysis/{analysis_id}/status', timeout=httpx.Timeout(10.0, connect=3.0))
+        
+        if response.status_code == 200:
+            return backend_json(response)
+        else:
+            return error_response(STATUS_FAILED, 500)
+    
+    except Exception as e:
+        logger.error("Status check error: %s", e)
+        return error_response(STATUS_CHECK_FAILED, 500)
+
+@app.get("/api/analytics/summary")
+async def get_analytics_summary(request: Request):
+    """Get analytics summary from backend"""
+    try:
+        response = await backend_client.get(
+            '/api/analytics/summary',
+            headers=conditional_headers(request),
+            timeout=httpx.Timeout(30.0, connect=3.0)
+        )
+        
+        if response.status_code in (200, 304):
+            return relay_json(request, response)
+        else:
+            return error_response(ANALYTICS_FAILED, 500)
+    
+    except Exception as e:
+        logger.error("Analytics error: %s", e)
+        return error_response(ANALYTICS_UNAVAILABLE, 500)
+
+@app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def index():
+    """Home page with upload form"""
+    return render_page('index.html')
+
+@app.api_route("/dashboard", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def dashboard():
+    """Analytics dashboard"""
+    return render_page('dashboard.html')
+
+@app.api_route("/about", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def about():
+    """About page"""
+    return render_page('about.html')
+
+@app.api_route("/results/{analysis_id}", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def results(analysis_id: str):
+    """Results page"""
+    return templates.get_template('results.html').render(analysis_id=analysis_id)
+
+@app.exception_handler(StarletteHTTPException)
+async def not_found(request: Request, exc: StarletteHTTPException):
+    """Serve the 404 page for unknown URLs, like the Flask app"""
+    if exc.status_code == 404:
+        return HTMLResponse(render_page('404.html'), status_code=404)
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(500)
+async def internal_error(request: Request, exc: Exception):
+    """Handle 500 errors"""
+    return HTMLResponse(render_page('500.html'), status_code=500)
+
+app.mount("/static", StaticFiles(directory=flask_app.static_folder), name="static")
@@ -7,8 +7,11 @@ Supports both local development and Railway production deployment
 import sys
 import subprocess
 import os
+import importlib.util
+import shutil
 import threading
 import time
+import urllib.request
 from pathlib import Path
 
 # Add current directory to Python path
@@ -18,19 +21,30 @@ def check_setup():
     """Run setup validation"""
     print("Validating Smart ATS setup...")
     try:
-        result = subprocess.run([sys.executable, "test_setup.py"], 
-                              capture_output=True, text=True)
-        
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
-        
-        return result.returncode == 0
+        # Run the checks in this interpreter rather than starting another one
+        from test_setup import main as run_setup_checks
+        return run_setup_checks()
     except Exception as e:
         print(f"Setup validation failed: {e}")
         return False
 
-def start_backend():
+# Packages the integrated server needs beyond the Flask frontend
+ASYNC_STACK_MODULES = ("uvicorn", "httpx")
+# uvloop is not available on Windows
+UVICORN_LOOP = "auto" if os.name == "nt" else "uvloop"
+
+def server_workers():
+    """Worker processes to run, from WEB_CONCURRENCY"""
+    # Multiple workers only share results through Redis, so default to one without it
+    default_workers = (os.cpu_count() or 1) if os.environ.get("REDIS_URL") else 1
+    return int(os.environ.get("WEB_CONCURRENCY", default_workers))
+
+def export_workers(workers):
+    """Publish the worker count, which each worker uses to size its analysis process pool"""
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    return workers
+
+def start_backend(workers=None):
     """Start the FastAPI backend server"""
     try:
         import uvicorn
@@ -41,7 +55,10 @@ def start_backend():
             host="0.0.0.0",
             port=port,
             log_level="info",
-            reload=False
+            reload=False,
+            workers=export_workers(workers or server_workers()),
+            loop=UVICORN_LOOP,
+            http="httptools"
         )
     except ImportError as e:
         print(f"Backend startup error: uvicorn not installed - {e}")
@@ -51,6 +68,21 @@ def start_backend():
         print(f"Backend startup error: {e}")
         sys.exit(1)
 
+def wait_for_backend(url, timeout=15):
+    """Poll the backend health check until it answers, backing off between attempts"""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/health", timeout=0.5) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass  # Not listening yet
+        time.sleep(delay)
+        delay = min(delay * 1.6, 0.5)
+    return False
+
 def start_frontend():
     """Start the Flask frontend server"""
     try:
@@ -71,6 +103,49 @@ def start_frontend():
         print(f"Frontend startup error: {e}")
         sys.exit(1)
 
+def create_integrated_app():
+    """Build the frontend ASGI app with backend calls served in-process (loaded by each uvicorn worker)"""
+    from backend.app.main import app as backend_app
+    from frontend import asgi
+    
+    # Backend calls go straight to the backend app, with no loopback HTTP
+    asgi.use_inprocess_backend(backend_app)
+    return asgi.app
+
+def start_integrated():
+    """Start the frontend with the backend app running in the same process"""
+    # Only look the async stack up here: each worker imports the apps itself, and
+    # import errors in the apps should surface rather than trigger the fallback
+    missing = [module for module in ASYNC_STACK_MODULES if importlib.util.find_spec(module) is None]
+    if missing:
+        # Without the async stack, run the backend on its own port next to Flask
+        print(f"In-process backend unavailable (missing {', '.join(missing)}), starting backend thread")
+        # Worker processes can only be managed from the main thread
+        backend_thread = threading.Thread(target=start_backend, args=(1,), daemon=True)
+        backend_thread.start()
+        backend_port = int(os.environ.get("PORT", os.environ.get("BACKEND_PORT", 8000)))
+        if not wait_for_backend(f"http://127.0.0.1:{backend_port}"):
+            print("Backend did not report healthy in time, starting frontend anyway")
+        start_frontend()
+        return
+    
+    try:
+        import uvicorn
+        port = int(os.environ.get("PORT", 5000))
+        uvicorn.run(
+            "main:create_integrated_app",
+            factory=True,
+            host="0.0.0.0",
+            port=port,
+            log_level="info",
+            workers=export_workers(server_workers()),
+            loop=UVICORN_LOOP,
+            http="httptools"
+        )
+    except Exception as e:
+        print(f"Integrated startup error: {e}")
+        sys.exit(1)
+
 def railway_deployment():
     """Handle Railway deployment"""
     print("🚀 Starting Smart ATS on Railway...")
@@ -94,22 +169,15 @@ def railway_deployment():
         start_backend()
     elif deployment_mode == "integrated":
         print("Starting integrated service...")
-        # Start backend in background thread for integrated deployment
-        print("Starting integrated backend...")
-        backend_thread = threading.Thread(target=start_backend, daemon=True)
-        backend_thread.start()
-        time.sleep(3)  # Give backend time to start
-        start_frontend()
+        start_integrated()
     else:  # Default to frontend mode
         print("Starting frontend service...")
-        # Start backend in background thread for integrated deployment
+        # Run the backend in this process unless an external one is configured
         if not os.environ.get("BACKEND_URL") or os.environ.get("BACKEND_URL") == "http://localhost:8000":
             print("Starting integrated backend...")
-            backend_thread = threading.Thread(target=start_backend, daemon=True)
-            backend_thread.start()
-            time.sleep(3)  # Give backend time to start
-        
-        start_frontend()
+            start_integrated()
+        else:
+            start_frontend()
 
 def start_services():
     """Start backend and frontend services"""
@@ -119,8 +187,7 @@ def start_services():
     if not Path(".env").exists():
         print("Creating .env from template...")
         if Path(".env.example").exists():
-            subprocess.run(["copy" if os.name == "nt" else "cp", 
-                          ".env.example", ".env"], shell=True)
+            shutil.copyfile(".env.example", ".env")
             print("Please edit .env file with your API keys before continuing.")
             return False
         else:
@@ -168,7 +235,10 @@ def main():
             print("  python main.py --help    - Show this help")
             return True
     
-    # Interactive mode for local development
+    # Interactive mode for local development; without a terminal, just validate
+    if not sys.stdin.isatty():
+        return check_setup()
+    
     print("\\nOptions:")
     print("1. Validate setup")
     print("2. Start services")
@@ -192,7 +262,7 @@ def main():
                 break
             else:
                 print("Invalid choice. Please select 1, 2, or 3.")
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\\nGoodbye!")
             break
     
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Test script to verify in-memory result storage and in-flight analysis sharing"""
+
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+sys.path.append('.')
+
+# Set up environment for testing
+os.environ['GOOGLE_API_KEY'] = 'test-key'  # Mock key for testing
+
+from backend.models.ats_models import AnalysisResult, AnalysisStatus
+from backend.services import result_store as result_store_module
+from backend.services.ai_service import AnalysisCache
+from backend.services.result_store import ResultStore
+
+def make_result(analysis_id, status=AnalysisStatus.COMPLETED, score=80):
+    """Build a minimal analysis result"""
+    return AnalysisResult(
+        id=analysis_id,
+        percentage_score=score,
+        jd_match=score,
+        missing_keywords=[],
+        profile_summary="Test summary",
+        grammar_mistakes=[],
+        word_repetitions=[],
+        format_issues=[],
+        readability_score=70,
+        timestamp=datetime.now(),
+        status=status
+    )
+
+class FakeClock:
+    """Stand-in for the time module so entries can expire without sleeping"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@contextmanager
+def fake_clock():
+    """Drive the result store's TTL checks from a FakeClock"""
+    clock = FakeClock()
+    real_time = result_store_module.time
+    result_store_module.time = clock
+    try:
+        yield clock
+    finally:
+        result_store_module.time = real_time
+
+def test_result_expiry():
+    """Test that expired results are no longer served, as models or as JSON"""
+    print("Testing result expiry...")
+
+    async def run():
+        with fake_clock() as clock:
+            store = ResultStore(ttl=60)
+            await store.set("a", make_result("a"))
+
+            assert (await store.get("a")).id == "a"
+            payload = await store.get_json("a")
+            assert payload is not None and b'"id":"a"' in payload
+            assert (await store.get_many(["a", "b"]))["b"] is None
+
+            clock.now += 61
+            assert await store.get("a") is None
+            assert await store.get_json("a") is None, "Expired result served from the payload cache"
+
+    asyncio.run(run())
+    print("✅ Expired results are dropped")
+
+def test_payload_refreshed_on_set():
+    """Test that replacing a result replaces its cached JSON payload"""
+    print("\nTesting payload refresh...")
+
+    async def run():
+        store = ResultStore(ttl=60)
+        await store.set("a", make_result("a", status=AnalysisStatus.PROCESSING, score=0))
+        assert b'"processing"' in await store.get_json("a")
+
+        await store.set("a", make_result("a"))
+        assert b'"completed"' in await store.get_json("a")
+
+    asyncio.run(run())
+    print("✅ Payloads follow the stored result")
+
+def test_max_results_eviction():
+    """Test that the oldest results are evicted beyond max_results"""
+    print("\nTesting max_results eviction...")
+
+    async def run():
+        store = ResultStore(ttl=60, max_results=2)
+        for analysis_id in ("a", "b", "c"):
+            await store.set(analysis_id, make_result(analysis_id))
+
+        assert await store.get("a") is None
+        assert await store.get_json("a") is None
+        assert (await store.get("b")).id == "b"
+        assert (await store.get("c")).id == "c"
+
+    asyncio.run(run())
+    print("✅ Oldest results evicted")
+
+def test_delete():
+    """Test that deleting a result removes it and reports whether it existed"""
+    print("\nTesting delete...")
+
+    async def run():
+        store = ResultStore(ttl=60)
+        await store.set("a", make_result("a"))
+        await store.get_json("a")
+
+        assert await store.delete("a") is True
+        assert await store.get("a") is None
+        assert await store.get_json("a") is None
+        assert await store.delete("a") is False
+
+    asyncio.run(run())
+    print("✅ Deleted results are gone")
+
+def test_inflight_sharing():
+    """Test that identical analyses share one in-flight future and its owner's ID"""
+    print("\nTesting in-flight sharing...")
+
+    async def run():
+        cache = AnalysisCache(capacity=8, ttl=60)
+
+        future, owner_id, owner = await cache.join_inflight("key", "first")
+        assert owner and owner_id == "first"
+
+        shared, shared_id, follower_owns = await cache.join_inflight("key", "second")
+        assert shared is future and shared_id == "first" and not follower_owns
+
+        result = make_result("first")
+        await cache.resolve_inflight("key", result)
+        assert await shared is result
+
+        # Resolved entries are forgotten, so the next analysis starts afresh
+        _, next_id, next_owns = await cache.join_inflight("key", "third")
+        assert next_owns and next_id == "third"
+
+    asyncio.run(run())
+    print("✅ In-flight analyses shared")
+
+def test_inflight_error():
+    """Test that a failed in-flight analysis raises in every waiting request"""
+    print("\nTesting in-flight errors...")
+
+    async def run():
+        cache = AnalysisCache(capacity=8, ttl=60)
+        future, _, _ = await cache.join_inflight("key")
+        shared, _, _ = await cache.join_inflight("key")
+
+        await cache.resolve_inflight("key", error=RuntimeError("Analysis failed"))
+        for waiting in (future, shared):
+            try:
+                await waiting
+            except RuntimeError as e:
+                assert str(e) == "Analysis failed"
+            else:
+                raise AssertionError("In-flight error was not raised")
+
+        # Resolving an entry that is already gone is a no-op
+        await cache.resolve_inflight("key", make_result("late"))
+
+    asyncio.run(run())
+    print("✅ In-flight errors reach every request")
+
+def run_test(test_func):
+    """Run a test when executed as a script, reporting a failure instead of raising it"""
+    try:
+        test_func()
+        return True
+    except Exception as e:
+        print(f"❌ {test_func.__name__} failed: {e!r}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Result Store Test Suite")
+    print("=" * 50)
+
+    success = True
+    success &= run_test(test_result_expiry)
+    success &= run_test(test_payload_refreshed_on_set)
+    success &= run_test(test_max_results_eviction)
+    success &= run_test(test_delete)
+    success &= run_test(test_inflight_sharing)
+    success &= run_test(test_inflight_error)
+
+    print("\n" + "=" * 50)
+    if success:
+        print("🎉 All result store tests passed!")
+    else:
+        print("❌ Some tests failed. Check the implementation.")
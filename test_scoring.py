@@ -8,8 +8,8 @@ sys.path.append('.')
 # Set up environment for testing
 os.environ['GOOGLE_API_KEY'] = 'test-key'  # Mock key for testing
 
-from backend.services.ai_service import AIAnalysisService
-from backend.utils.document_parser import TextAnalyzer
+from backend.services.ai_service import AIAnalysisService, COMMON_WORDS
+from backend.utils.document_parser import TextAnalyzer, WORD_PATTERN
 
 def test_scoring_components():
     """Test individual components of the scoring algorithm"""
@@ -35,6 +35,7 @@ def test_scoring_components():
     
     readability = analyzer.calculate_readability_score(sample_resume)
     print(f"Readability Score: {readability}")
+    assert 35 <= readability <= 90, f"Readability score {readability} outside expected range (35-90)"
     
     # Test AI service initialization (without actual API call)
     try:
@@ -89,14 +90,13 @@ def test_scoring_components():
                 case['readability']
             )
             print(f"{case['name']}: {score}% (JD Match: {case['jd_match']}%)")
+            assert 0 <= score <= 100, f"{case['name']} score {score}% outside 0-100"
         
         print("\n✅ All scoring components working correctly!")
         
     except Exception as e:
         print(f"❌ Error in scoring test: {str(e)}")
-        return False
-    
-    return True
+        raise
 
 def test_fallback_scoring():
     """Test the fallback scoring mechanism"""
@@ -105,20 +105,16 @@ def test_fallback_scoring():
     try:
         class MockAIService:
             def _calculate_fallback_score(self, resume_text, job_description):
-                import re
-                # Extract keywords from job description
-                jd_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower()))
-                # Remove common words
-                common_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
-                jd_keywords = jd_words - common_words
+                # Extract keywords from job description (compiled pattern and stopwords shared with the service)
+                jd_keywords = set(WORD_PATTERN.findall(job_description.lower())) - COMMON_WORDS
                 
                 # Count matches in resume
-                resume_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower()))
-                matches = len(jd_keywords.intersection(resume_words))
+                matches = len(jd_keywords.intersection(WORD_PATTERN.findall(resume_text.lower())))
                 total_keywords = max(len(jd_keywords), 1)
                 
                 # Calculate percentage with some baseline
-                base_score = min(85, max(35, (matches / total_keywords) * 100))  # 35-85% range
+                match_percent = (matches / total_keywords) * 100
+                base_score = 35 if match_percent < 35 else 85 if match_percent > 85 else match_percent  # 35-85% range
                 
                 return round(base_score, 2)
         
@@ -130,15 +126,19 @@ def test_fallback_scoring():
         fallback_score = mock_service._calculate_fallback_score(sample_resume, sample_jd)
         print(f"Fallback Score: {fallback_score}%")
         
-        if 35 <= fallback_score <= 85:
-            print("✅ Fallback scoring working correctly!")
-            return True
-        else:
-            print(f"❌ Fallback score {fallback_score}% outside expected range (35-85%)")
-            return False
+        assert 35 <= fallback_score <= 85, f"Fallback score {fallback_score}% outside expected range (35-85%)"
+        print("✅ Fallback scoring working correctly!")
             
     except Exception as e:
         print(f"❌ Error in fallback scoring test: {str(e)}")
+        raise
+
+def run_test(test_func):
+    """Run a test when executed as a script, reporting a failure instead of raising it"""
+    try:
+        test_func()
+        return True
+    except Exception:
         return False
 
 if __name__ == "__main__":
@@ -146,8 +146,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     success = True
-    success &= test_scoring_components()
-    success &= test_fallback_scoring()
+    success &= run_test(test_scoring_components)
+    success &= run_test(test_fallback_scoring)
     
     print("\n" + "=" * 50)
     if success:
@@ -4,17 +4,27 @@ Test script to validate Smart ATS setup and basic functionality
 
 import sys
 import os
+import importlib
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def test_python_version():
     """Test if Python version is compatible"""
     version = sys.version_info
-    if version.major >= 3 and version.minor >= 8:
+    if version.major >= 3 and version.minor >= 9:
         print("✓ Python version is compatible:", sys.version)
         return True
     else:
-        print("✗ Python version too old. Requires Python 3.8+")
+        print("✗ Python version too old. Requires Python 3.9+")
+        return False
+
+def try_import(package):
+    """Import a package, reporting whether it is installed"""
+    try:
+        importlib.import_module(package)
+        return True
+    except ImportError:
         return False
 
 def test_dependencies():
@@ -30,15 +40,15 @@ def test_dependencies():
         'requests'
     ]
     
+    # Import in parallel so reading one package's files overlaps with the others
+    with ThreadPoolExecutor(max_workers=len(required_packages)) as executor:
+        available = list(executor.map(try_import, required_packages))
+    
     missing = []
-    for package in required_packages:
-        try:
-            if package == 'docx':
-                import docx
-            else:
-                __import__(package)
+    for package, is_available in zip(required_packages, available):
+        if is_available:
             print(f"✓ {package} is available")
-        except ImportError:
+        else:
             missing.append(package)
             print(f"✗ {package} is missing")
     